@@ -6,6 +6,7 @@ const jwt = require("jsonwebtoken")
 const { spawn } = require("child_process")
 const WebSocket = require("ws")
 const http = require("http")
+const net = require("net")
 
 const app = express()
 const server = http.createServer(app)
@@ -200,6 +201,128 @@ const requireAdmin = (req, res, next) => {
   next()
 }
 
+// ML Inference Service
+// A resident Python process (ml_models/inference_server.py) keeps the models warm
+// and speaks newline-delimited JSON over a Unix socket.
+const ML_SOCKET = process.env.ML_SOCKET || "/tmp/eduai-ml.sock"
+const ML_TIMEOUT_MS = Number(process.env.ML_TIMEOUT_MS || 10000)
+
+let mlSocket = null
+let mlConnecting = null
+let mlBuffer = ""
+let mlRequestId = 0
+const mlPending = new Map()
+
+const startInferenceServer = () => {
+  const inferenceProcess = spawn("python", ["ml_models/inference_server.py", "--socket", ML_SOCKET], {
+    stdio: ["ignore", "inherit", "inherit"],
+  })
+  inferenceProcess.on("exit", (code) => {
+    console.log(`Inference server exited with code ${code}, restarting`)
+    setTimeout(startInferenceServer, 1000)
+  })
+}
+
+const connectMl = () => {
+  if (mlSocket) return Promise.resolve(mlSocket)
+  if (mlConnecting) return mlConnecting
+
+  mlConnecting = new Promise((resolve, reject) => {
+    const socket = net.createConnection(ML_SOCKET)
+    socket.setEncoding("utf8")
+    socket.once("connect", () => {
+      mlSocket = socket
+      mlConnecting = null
+      resolve(socket)
+    })
+    socket.on("error", (error) => {
+      mlConnecting = null
+      reject(error)
+    })
+    socket.on("data", (chunk) => {
+      mlBuffer += chunk
+      let newline
+      while ((newline = mlBuffer.indexOf("\n")) >= 0) {
+        const line = mlBuffer.slice(0, newline)
+        mlBuffer = mlBuffer.slice(newline + 1)
+        const reply = JSON.parse(line)
+        const pending = mlPending.get(reply.id)
+        if (!pending) continue
+        // Streaming methods send events before their final result
+        if (reply.event) {
+          if (pending.onEvent) pending.onEvent(reply.event)
+          continue
+        }
+        mlPending.delete(reply.id)
+        clearTimeout(pending.timer)
+        reply.error ? pending.reject(new Error(reply.error)) : pending.resolve(reply.result)
+      }
+    })
+    socket.on("close", () => {
+      mlSocket = null
+      mlBuffer = ""
+      mlPending.forEach((pending) => {
+        clearTimeout(pending.timer)
+        pending.reject(new Error("Inference server connection closed"))
+      })
+      mlPending.clear()
+    })
+  })
+  return mlConnecting
+}
+
+const mlRequest = async (method, params = {}, onEvent = null) => {
+  const socket = await connectMl()
+  const id = ++mlRequestId
+
+  return new Promise((resolve, reject) => {
+    const timer = setTimeout(() => {
+      mlPending.delete(id)
+      reject(new Error(`Inference request timed out: ${method}`))
+    }, ML_TIMEOUT_MS)
+    mlPending.set(id, { resolve, reject, timer, onEvent })
+    socket.write(JSON.stringify({ id, method, params }) + "\n")
+  })
+}
+
+// Fallback for when the inference server is unavailable
+const spawnChatbot = (message, context) =>
+  new Promise((resolve) => {
+    const pythonProcess = spawn("python", ["ml_models/chatbot.py", message, context])
+
+    let aiResponse = ""
+    pythonProcess.stdout.on("data", (data) => {
+      aiResponse += data.toString()
+    })
+    pythonProcess.on("close", () => resolve(aiResponse.trim()))
+  })
+
+// Streaming fallback: the chatbot prints one JSON event per line as each part is ready
+const spawnChatbotStream = (message, context, onEvent) =>
+  new Promise((resolve) => {
+    const pythonProcess = spawn("python", ["ml_models/chatbot.py", "--stream", message, context])
+
+    let buffer = ""
+    let response = ""
+    pythonProcess.stdout.on("data", (data) => {
+      buffer += data.toString()
+      let newline
+      while ((newline = buffer.indexOf("\n")) >= 0) {
+        const line = buffer.slice(0, newline)
+        buffer = buffer.slice(newline + 1)
+        if (!line.trim()) continue
+        const event = JSON.parse(line)
+        if (event.event === "end") response = event.response
+        onEvent(event)
+      }
+    })
+    pythonProcess.on("close", () => resolve(response))
+  })
+
+if (process.env.ML_AUTOSTART !== "false") {
+  startInferenceServer()
+}
+
 // Routes
 
 // Authentication Routes
@@ -395,34 +518,69 @@ app.post("/api/chat", authenticateToken, async (req, res) => {
     const { message, context } = req.body
     const userId = req.user.userId
 
-    // Call Python AI model
-    const pythonProcess = spawn("python", ["ml_models/chatbot.py", message, context])
-
-    let aiResponse = ""
-    pythonProcess.stdout.on("data", (data) => {
-      aiResponse += data.toString()
-    })
+    // Streaming clients get newline-delimited JSON events as each part of the reply is ready
+    const streaming = req.query.stream === "1" || (req.headers.accept || "").includes("application/x-ndjson")
+    let eventsSent = 0
+    const sendEvent = (event) => {
+      eventsSent++
+      res.write(JSON.stringify(event) + "\n")
+    }
+    if (streaming) {
+      res.setHeader("Content-Type", "application/x-ndjson")
+      res.setHeader("Cache-Control", "no-cache")
+      res.flushHeaders()
+    }
 
-    pythonProcess.on("close", async (code) => {
-      // Save chat to database
-      let chat = await Chat.findOne({ userId })
-      if (!chat) {
-        chat = new Chat({ userId, messages: [], sessionId: Date.now().toString() })
+    // Call the resident inference server, falling back to a one-off process
+    let aiResponse
+    try {
+      if (streaming) {
+        const result = await mlRequest("chat_stream", { message, context, session_id: String(userId) }, sendEvent)
+        aiResponse = result.response
+      } else {
+        const result = await mlRequest("chat", { message, context, session_id: String(userId) })
+        aiResponse = result.response
       }
+    } catch (mlError) {
+      // A reply that already started streaming cannot be restarted
+      if (eventsSent) throw mlError
+      aiResponse = streaming
+        ? await spawnChatbotStream(message, context, sendEvent)
+        : await spawnChatbot(message, context)
+    }
 
-      chat.messages.push(
-        { role: "user", content: message, timestamp: new Date(), context },
-        { role: "assistant", content: aiResponse.trim(), timestamp: new Date(), context },
-      )
+    // Save chat to database
+    let chat = await Chat.findOne({ userId })
+    if (!chat) {
+      chat = new Chat({ userId, messages: [], sessionId: Date.now().toString() })
+    }
 
-      await chat.save()
-      res.json({ response: aiResponse.trim() })
-    })
+    chat.messages.push(
+      { role: "user", content: message, timestamp: new Date(), context },
+      { role: "assistant", content: aiResponse, timestamp: new Date(), context },
+    )
+
+    await chat.save()
+    if (streaming) return res.end()
+    res.json({ response: aiResponse })
   } catch (error) {
+    if (res.headersSent) {
+      res.write(JSON.stringify({ event: "error", error: error.message }) + "\n")
+      return res.end()
+    }
     res.status(500).json({ error: error.message })
   }
 })
 
+app.get("/api/ml/health", async (req, res) => {
+  try {
+    const health = await mlRequest("health")
+    res.json(health)
+  } catch (error) {
+    res.status(503).json({ status: "unavailable", error: error.message })
+  }
+})
+
 // Analytics Routes
 app.get("/api/analytics/dashboard", authenticateToken, async (req, res) => {
   try {
@@ -1,11 +1,331 @@
 import pandas as pd
 import numpy as np
 import json
-from datetime import datetime, timedelta
-import random
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 
-class EducationDatasetGenerator:
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Columnar output is optional
+    pa = None
+    pq = None
+
+OUTPUT_FORMATS = ('csv', 'json', 'parquet', 'feather')
+
+LOCATIONS = [
+    'New York', 'California', 'Texas', 'Florida', 'Illinois',
+    'Pennsylvania', 'Ohio', 'Georgia', 'North Carolina', 'Michigan'
+]
+
+COURSE_TITLES = [
+    'Introduction to Python Programming',
+    'Advanced JavaScript Concepts',
+    'Data Science with R',
+    'Machine Learning Fundamentals',
+    'Web Development Bootcamp',
+    'Mobile App Development',
+    'Database Design and Management',
+    'Cybersecurity Essentials',
+    'Digital Marketing Strategy',
+    'UI/UX Design Principles',
+    'Cloud Computing with AWS',
+    'Artificial Intelligence Basics',
+    'Blockchain Technology',
+    'DevOps and CI/CD',
+    'React.js Complete Guide',
+    'Node.js Backend Development',
+    'Data Visualization with D3.js',
+    'Statistics for Data Science',
+    'Linear Algebra for ML',
+    'Computer Vision Fundamentals'
+]
+
+INSTRUCTORS = [
+    'Dr. Sarah Johnson', 'Prof. Michael Chen', 'Dr. Emily Rodriguez',
+    'James Wilson', 'Lisa Park', 'David Kim', 'Maria Garcia',
+    'Robert Taylor', 'Jennifer Lee', 'Alex Thompson'
+]
+
+CATEGORIES = [
+    'Programming', 'Data Science', 'Web Development', 'Mobile Development',
+    'Machine Learning', 'Cybersecurity', 'Design', 'Business', 'Mathematics'
+]
+
+COURSE_TAGS = [
+    'beginner-friendly', 'hands-on', 'project-based', 'certification',
+    'popular', 'trending', 'updated-2024', 'industry-relevant'
+]
+
+QUESTION_TYPES = ['multiple_choice', 'true_false', 'short_answer', 'essay', 'coding']
+
+QUIZ_KINDS = ['Fundamentals', 'Advanced', 'Practice', 'Final']
+
+# Sequential id columns that compact frames keep as integer numbers until output
+ID_FORMATS = {
+    'interaction_id': ('INT_', 6),
+    'student_id': ('STU_', 4),
+    'course_id': ('CRS_', 4),
+    'quiz_id': ('QUZ_', 4)
+}
+
+# Per-row strings derived from a table's own id number, omitted by compact frames
+DERIVED_COLUMNS = {
+    'student_id': {'name': 'Student {}', 'email': 'student{}@eduai.com'}
+}
+
+def categorical(rng, categories, size, p=None):
+    """Draw a whole categorical column at once as codes over a shared dictionary"""
+    codes = rng.choice(len(categories), size=size, p=p)
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+def days_before(rng, reference_date, low, high, size):
+    """Dates `low` to `high - 1` days before the reference date, as datetime64[D]"""
+    return reference_date - rng.integers(low, high, size).astype('timedelta64[D]')
+
+def sample_masks(rng, pool_size, low, high, size):
+    """Per-row samples without replacement of `low` to `high - 1` pool items, as bitmasks"""
+    counts = rng.integers(low, high, size)
+    # A random permutation of the pool per row; each row keeps its first `count` items
+    picks = rng.random((size, pool_size)).argsort(axis=1)
+    masks = np.zeros(size, dtype=np.int32)
+    for column in range(min(high - 1, pool_size)):
+        masks |= np.where(column < counts, 1 << picks[:, column], 0).astype(np.int32)
+    return masks
+
+def decode_masks(masks, pool):
+    """Expand bitmasks from sample_masks into lists of pool items, in pool order"""
+    masks = np.asarray(masks)
+    distinct, inverse = np.unique(masks, return_inverse=True)
+    # At most 2 ** len(pool) distinct subsets, so each is decoded once
+    decoded = [[item for bit, item in enumerate(pool) if mask >> bit & 1] for mask in distinct.tolist()]
+    return [list(decoded[i]) for i in inverse.tolist()]
+
+def popularity_cdf(count, exponent, seed):
+    """Cumulative Zipf weights over `count` items whose popularity ranks are shuffled
+
+    The rank permutation depends only on `seed`, so every chunk and shard agrees
+    on which items are hot. An exponent of 0 gives uniform popularity.
+    """
+    ranks = np.random.default_rng(seed).permutation(count) + 1
+    cdf = np.cumsum(ranks.astype(np.float64) ** -exponent)
+    return cdf / cdf[-1]
+
+def draw_unique_pairs(rng, n, student_cdf, course_cdf, max_rounds=50, part=0, num_parts=1):
+    """Draw n distinct (student, course) position pairs from two popularity CDFs
+
+    Pairs are hashed as one int64 key and deduplicated with a hash table; the
+    shortfall is redrawn until n distinct pairs exist, keeping first-draw order.
+
+    With num_parts > 1 only pairs whose (student + course) % num_parts equals
+    `part` are drawn, from the popularity distribution conditioned on that
+    slice. Frames given different parts never share a pair, so chunks and
+    shards stay unique across the whole dataset without seeing each other.
+    """
+    num_students, num_courses = len(student_cdf), len(course_cdf)
+    student_positions = np.arange(num_students)
+    # Each student's slice partners are the courses in one residue class mod num_parts
+    student_class = (part - student_positions) % num_parts
+    class_sizes = np.bincount(np.arange(num_courses) % num_parts, minlength=num_parts)
+    capacity = int(class_sizes[student_class].sum())
+    if n > capacity:
+        raise ValueError(
+            f"Cannot draw {n} unique pairs from {num_students} students x {num_courses} courses"
+            + (f" (slice {part} of {num_parts} holds {capacity})" if num_parts > 1 else '')
+        )
+
+    if num_parts > 1:
+        course_weights = np.diff(course_cdf, prepend=0.0)
+        class_mass = np.bincount(np.arange(num_courses) % num_parts, course_weights, minlength=num_parts)
+        # Students weighted by how much course popularity their slice partners hold
+        student_cdf = np.cumsum(np.diff(student_cdf, prepend=0.0) * class_mass[student_class])
+        student_cdf /= student_cdf[-1]
+        # Courses grouped by class, class k's CDF rescaled onto (k, k + 1]
+        course_order = np.argsort(np.arange(num_courses) % num_parts, kind='stable')
+        course_class = course_order % num_parts
+        class_ends = np.cumsum(class_sizes)
+        mass_before = np.cumsum(class_mass) - class_mass
+        class_cdf = course_class + (np.cumsum(course_weights[course_order]) - mass_before[course_class]) / class_mass[course_class]
+
+    keys = np.empty(0, dtype=np.int64)
+    for _ in range(max_rounds):
+        missing = n - len(keys)
+        if missing <= 0:
+            return keys[:n] // num_courses, keys[:n] % num_courses
+        # Oversample so heavy skew rarely needs another round
+        draw = 2 * missing + 64
+        students = np.minimum(np.searchsorted(student_cdf, rng.random(draw), side='right'), num_students - 1)
+        if num_parts > 1:
+            classes = student_class[students]
+            rows = np.searchsorted(class_cdf, classes + rng.random(draw), side='right')
+            courses = course_order[np.minimum(rows, class_ends[classes] - 1)]
+            # Rounding at a CDF edge can step outside the slice; never let such a pair through
+            inside = (students + courses) % num_parts == part
+            students, courses = students[inside], courses[inside]
+        else:
+            courses = np.minimum(np.searchsorted(course_cdf, rng.random(draw), side='right'), num_courses - 1)
+        keys = pd.unique(np.concatenate([keys, students.astype(np.int64) * num_courses + courses]))
+    raise ValueError(f"Could not draw {n} unique pairs in {max_rounds} rounds; lower the popularity skew")
+
+def format_ids(prefix, start, size, width):
+    """Sequential ids like STU_0001 for rows start .. start + size - 1"""
+    return [f'{prefix}{i:0{width}d}' for i in range(start + 1, start + size + 1)]
+
+def format_numbers(prefix, numbers, width):
+    """Format integer id numbers like 1 -> STU_0001"""
+    return [f'{prefix}{i:0{width}d}' for i in np.asarray(numbers).tolist()]
+
+class IdSpace:
+    """Sequential id range (e.g. STU_0001 .. STU_1000) referenced without materialising it"""
+    
+    def __init__(self, prefix, count, width):
+        self.prefix = prefix
+        self.count = count
+        self.width = width
+    
+    def __len__(self):
+        return self.count
+    
+    def take(self, positions):
+        return format_numbers(self.prefix, np.asarray(positions) + 1, self.width)
+
+def take_ids(ids, positions):
+    """Look up ids by position in an IdSpace or an id array"""
+    if isinstance(ids, IdSpace):
+        return ids.take(positions)
+    # Keeps integer ids of compact frames as integers
+    return np.asarray(ids)[positions]
+
+def require_pyarrow(fmt):
+    if pa is None:
+        raise ImportError(f"Writing {fmt} output requires pyarrow (pip install pyarrow)")
+
+def write_dataset(df, output_dir, name, formats=('csv', 'json')):
+    """Write one complete dataset in each requested format"""
+    for fmt in formats:
+        if fmt == 'csv':
+            df.to_csv(f'{output_dir}/{name}.csv', index=False)
+        elif fmt == 'json':
+            df.to_json(f'{output_dir}/{name}.json', orient='records', indent=2, date_format='iso')
+        elif fmt == 'parquet':
+            require_pyarrow(fmt)
+            # Categoricals become dictionary-encoded columns, list columns native list<string>
+            df.to_parquet(f'{output_dir}/{name}.parquet', index=False, engine='pyarrow')
+        elif fmt == 'feather':
+            require_pyarrow(fmt)
+            # Uncompressed so readers can memory-map the file instead of decoding it
+            df.to_feather(f'{output_dir}/{name}.feather', compression='uncompressed')
+        else:
+            raise ValueError(f"Unknown output format: {fmt}")
+
+class ChunkWriter:
+    """Appends DataFrame chunks to one output file in a given format"""
+    
+    def __init__(self, output_dir, name, fmt):
+        self.fmt = fmt
+        self.rows = 0
+        self.writer = None
+        if fmt in ('parquet', 'feather'):
+            require_pyarrow(fmt)
+            self.path = f'{output_dir}/{name}.{fmt}'
+        elif fmt == 'csv':
+            self.file = open(f'{output_dir}/{name}.csv', 'w', newline='')
+        elif fmt == 'json':
+            # JSON Lines, since a JSON array cannot be appended to
+            self.file = open(f'{output_dir}/{name}.jsonl', 'w')
+        else:
+            raise ValueError(f"Unknown output format: {fmt}")
+    
+    def append(self, chunk):
+        if self.fmt == 'csv':
+            chunk.to_csv(self.file, index=False, header=(self.rows == 0))
+        elif self.fmt == 'json':
+            records = chunk.to_json(orient='records', lines=True, date_format='iso')
+            self.file.write(records if records.endswith('\n') else records + '\n')
+        else:
+            if self.writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                self.schema = table.schema
+                if self.fmt == 'parquet':
+                    self.writer = pq.ParquetWriter(self.path, self.schema)
+                else:
+                    self.writer = pa.ipc.new_file(self.path, self.schema,
+                                                  options=pa.ipc.IpcWriteOptions(compression=None))
+            else:
+                # Cast to the first chunk's schema so every row group / batch matches
+                table = pa.Table.from_pandas(chunk, schema=self.schema, preserve_index=False)
+            self.writer.write_table(table)
+        self.rows += len(chunk)
+    
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        elif self.fmt in ('csv', 'json'):
+            self.file.close()
+
+class StreamingSummary:
+    """Summary statistics accumulated chunk by chunk in constant memory"""
+    
     def __init__(self):
+        self.moments = {}
+        self.counts = {}
+    
+    def update_numeric(self, name, values):
+        """Merge a chunk into running count/mean/M2/min/max (Chan et al. parallel update)"""
+        values = np.asarray(values, dtype=float)
+        if len(values) == 0:
+            return
+        n_b, mean_b = len(values), values.mean()
+        m2_b = ((values - mean_b) ** 2).sum()
+        n_a, mean_a, m2_a, low, high = self.moments.get(name, (0, 0.0, 0.0, np.inf, -np.inf))
+        n = n_a + n_b
+        delta = mean_b - mean_a
+        self.moments[name] = (
+            n,
+            mean_a + delta * n_b / n,
+            m2_a + m2_b + delta ** 2 * n_a * n_b / n,
+            min(low, values.min()),
+            max(high, values.max())
+        )
+    
+    def update_counts(self, name, values):
+        totals = self.counts.setdefault(name, {})
+        for key, count in pd.Series(values).value_counts().items():
+            totals[key] = totals.get(key, 0) + int(count)
+    
+    def mean(self, name):
+        return float(self.moments[name][1]) if name in self.moments else None
+    
+    def describe(self, name):
+        n, mean, m2, low, high = self.moments[name]
+        return {
+            'count': float(n),
+            'mean': float(mean),
+            'std': float(np.sqrt(m2 / (n - 1))) if n > 1 else 0.0,
+            'min': float(low),
+            'max': float(high)
+        }
+    
+    def value_counts(self, name):
+        return dict(sorted(self.counts.get(name, {}).items(), key=lambda item: -item[1]))
+
+def _write_shard(generator, builder, seed_sequence, start, size, references, output_dir, name, fmt, chunk_size):
+    """Generate rows start .. start + size - 1 of one dataset into a single shard file"""
+    # Module-level so ProcessPoolExecutor can pickle it
+    rng = np.random.default_rng(seed_sequence)
+    make_frame = getattr(generator, builder)
+    writer = ChunkWriter(output_dir, name, fmt)
+    try:
+        for offset in range(0, size, chunk_size):
+            chunk = make_frame(rng, start + offset, min(chunk_size, size - offset), *references)
+            writer.append(generator.expand_compact(chunk))
+    finally:
+        writer.close()
+    return writer.rows
+
+class EducationDatasetGenerator:
+    def __init__(self, seed=42, reference_date=None, student_skew=0.8, course_skew=1.1, compact=False):
         self.subjects = [
             'Mathematics', 'Computer Science', 'Physics', 'Chemistry', 'Biology',
             'English Literature', 'History', 'Psychology', 'Economics', 'Art'
@@ -17,265 +337,481 @@ class EducationDatasetGenerator:
         
         self.skill_levels = ['Beginner', 'Intermediate', 'Advanced', 'Expert']
         
+        self.seed = seed
+        # All generated dates are relative to this day
+        self.reference_date = np.datetime64(reference_date or datetime.now().date(), 'D')
+        # Zipf exponents of student activity and course popularity (0 = uniform)
+        self.student_skew = student_skew
+        self.course_skew = course_skew
+        self._popularity = {}
+        # Compact frames keep ids as integers and list columns as bitmasks until output
+        self.compact = compact
+        self.list_pools = {
+            'preferred_subjects': self.subjects,
+            'programming_languages_known': self.programming_languages,
+            'prerequisites': COURSE_TITLES,
+            'skills_taught': self.programming_languages + self.subjects,
+            'tags': COURSE_TAGS,
+            'question_types': QUESTION_TYPES,
+            'topics_covered': self.subjects
+        }
+    
+    def _popularity_cdf(self, count, exponent, salt):
+        key = (count, exponent, salt)
+        if key not in self._popularity:
+            self._popularity[key] = popularity_cdf(count, exponent, [self.seed, salt])
+        return self._popularity[key]
+    
+    def _ids(self, column, start, n):
+        prefix, width = ID_FORMATS[column]
+        if self.compact:
+            return np.arange(start + 1, start + n + 1, dtype=np.int32)
+        return format_ids(prefix, start, n, width)
+    
+    def _take(self, ids, positions):
+        if self.compact and isinstance(ids, IdSpace):
+            return (np.asarray(positions) + 1).astype(np.int32)
+        return take_ids(ids, positions)
+    
+    def _lists(self, rng, column, low, high, n):
+        pool = self.list_pools[column]
+        masks = sample_masks(rng, len(pool), low, high, n)
+        return masks if self.compact else decode_masks(masks, pool)
+    
+    def expand_compact(self, df):
+        """Format a compact frame for output: id strings, derived columns and lists
+        
+        Frames from a non-compact generator are returned unchanged, so writers can
+        call this unconditionally.
+        """
+        if not self.compact:
+            return df
+        columns = {}
+        for column in df.columns:
+            values = df[column].to_numpy()
+            if column in ID_FORMATS:
+                prefix, width = ID_FORMATS[column]
+                columns[column] = format_numbers(prefix, values, width)
+                # Derived strings belong to the table whose primary key this is
+                if column == df.columns[0]:
+                    for name, template in DERIVED_COLUMNS.get(column, {}).items():
+                        columns[name] = [template.format(i) for i in values.tolist()]
+            elif column in self.list_pools:
+                columns[column] = decode_masks(values, self.list_pools[column])
+            else:
+                columns[column] = df[column]
+        return pd.DataFrame(columns, index=df.index)
+    
+    def _student_frame(self, rng, start, n):
+        total_courses_enrolled = rng.integers(1, 15, n)
+        columns = {'student_id': self._ids('student_id', start, n)}
+        if not self.compact:
+            ids = np.arange(start + 1, start + n + 1)
+            columns['name'] = [f'Student {i}' for i in ids]
+            columns['email'] = [f'student{i}@eduai.com' for i in ids]
+        columns.update({
+            'age': rng.integers(18, 45, n),
+            'gender': categorical(rng, ['Male', 'Female', 'Other'], n, p=[0.45, 0.45, 0.1]),
+            'location': categorical(rng, LOCATIONS, n),
+            'education_level': categorical(rng, [
+                'High School', 'Bachelor\'s', 'Master\'s', 'PhD'
+            ], n, p=[0.3, 0.4, 0.25, 0.05]),
+            'employment_status': categorical(rng, [
+                'Student', 'Employed', 'Unemployed', 'Self-employed'
+            ], n, p=[0.4, 0.45, 0.1, 0.05]),
+            'learning_style': categorical(rng, [
+                'Visual', 'Auditory', 'Kinesthetic', 'Reading/Writing'
+            ], n),
+            'motivation_level': rng.integers(1, 11, n),
+            'tech_proficiency': categorical(rng, self.skill_levels, n),
+            'preferred_study_time': categorical(rng, [
+                'Morning', 'Afternoon', 'Evening', 'Night'
+            ], n),
+            'device_preference': categorical(rng, [
+                'Desktop', 'Laptop', 'Tablet', 'Mobile'
+            ], n, p=[0.2, 0.5, 0.2, 0.1]),
+            'internet_speed': categorical(rng, [
+                'Slow', 'Medium', 'Fast', 'Very Fast'
+            ], n, p=[0.1, 0.3, 0.4, 0.2]),
+            'registration_date': days_before(rng, self.reference_date, 1, 365, n),
+            'last_login': days_before(rng, self.reference_date, 0, 30, n),
+            'total_courses_enrolled': total_courses_enrolled,
+            # Completed courses never exceed enrollment
+            'courses_completed': rng.integers(0, total_courses_enrolled + 1),
+            'total_study_hours': rng.integers(10, 500, n),
+            'average_session_duration': rng.integers(15, 180, n),  # minutes
+            'forum_posts': rng.integers(0, 50, n),
+            'help_requests': rng.integers(0, 20, n),
+            'peer_interactions': rng.integers(0, 100, n),
+            'certificates_earned': rng.integers(0, 10, n),
+            'current_streak': rng.integers(0, 100, n),
+            'longest_streak': rng.integers(0, 200, n),
+            'xp_points': rng.integers(0, 10000, n),
+            'level': rng.integers(1, 50, n),
+            'badges': rng.integers(0, 25, n),
+            'preferred_subjects': self._lists(rng, 'preferred_subjects', 1, 4, n),
+            'programming_languages_known': self._lists(rng, 'programming_languages_known', 0, 4, n),
+            'career_goals': categorical(rng, [
+                'Software Developer', 'Data Scientist', 'Web Designer',
+                'Product Manager', 'Teacher', 'Researcher', 'Entrepreneur'
+            ], n),
+            'satisfaction_score': rng.integers(1, 11, n),
+            'recommendation_score': rng.integers(1, 11, n)
+        })
+        return pd.DataFrame(columns, copy=False)
+    
+    def _course_frame(self, rng, start, n):
+        base = rng.integers(0, len(COURSE_TITLES), n)
+        lowered = [title.lower() for title in COURSE_TITLES]
+        level_numbers = rng.integers(1, 4, n)
+        return pd.DataFrame({
+            'course_id': self._ids('course_id', start, n),
+            'title': pd.Categorical.from_codes(
+                base * 3 + level_numbers - 1,
+                categories=[f'{title} - Level {level}' for title in COURSE_TITLES for level in (1, 2, 3)]
+            ),
+            'description': pd.Categorical.from_codes(base, categories=[
+                f'Comprehensive course covering {title} concepts and practical applications.' for title in lowered
+            ]),
+            'instructor': categorical(rng, INSTRUCTORS, n),
+            'category': categorical(rng, CATEGORIES, n),
+            'subcategory': categorical(rng, [f'{category} Specialization' for category in CATEGORIES], n),
+            'level': categorical(rng, self.skill_levels, n),
+            'duration_weeks': rng.integers(4, 16, n),
+            'duration_hours': rng.integers(10, 80, n),
+            'price': rng.choice([0, 29, 49, 79, 99, 149, 199], n),
+            'currency': pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=['USD']),
+            'language': categorical(rng, ['English', 'Spanish', 'French'], n, p=[0.8, 0.15, 0.05]),
+            'rating': np.round(rng.uniform(3.5, 5.0, n), 1),
+            'num_ratings': rng.integers(10, 1000, n),
+            'num_students': rng.integers(50, 5000, n),
+            'completion_rate': np.round(rng.uniform(0.6, 0.95, n), 2),
+            'difficulty_score': rng.integers(1, 10, n),
+            'prerequisites': self._lists(rng, 'prerequisites', 0, 3, n),
+            'learning_outcomes': [
+                [
+                    f'Understand {lowered[b]} fundamentals',
+                    f'Apply {lowered[b]} in real projects',
+                    f'Master advanced {lowered[b]} techniques'
+                ]
+                for b in base
+            ],
+            'skills_taught': self._lists(rng, 'skills_taught', 2, 6, n),
+            'certificate_available': rng.random(n) < 0.8,
+            'hands_on_projects': rng.integers(1, 8, n),
+            'quizzes': rng.integers(5, 20, n),
+            'assignments': rng.integers(3, 15, n),
+            'video_hours': rng.integers(5, 40, n),
+            'reading_materials': rng.integers(10, 50, n),
+            'forum_discussions': rng.integers(0, 100, n),
+            'created_date': days_before(rng, self.reference_date, 30, 730, n),
+            'last_updated': days_before(rng, self.reference_date, 1, 90, n),
+            'enrollment_status': categorical(rng, ['Open', 'Closed', 'Waitlist'], n, p=[0.7, 0.2, 0.1]),
+            'tags': self._lists(rng, 'tags', 2, 5, n)
+        }, copy=False)
+    
+    def _interaction_frame(self, rng, start, n, student_ids, course_ids, total=None, frame_starts=None):
+        """Interactions start .. start + n - 1 of `total`, unique per (student, course)
+
+        Students and courses are drawn from shuffled Zipf popularity, so a few
+        courses and very active students dominate. Row i of `total` enrolls in
+        time slot i of the past year, so timestamps increase with interaction_id
+        across chunks and shards without sorting.
+
+        `frame_starts` lists the first row of every frame the dataset is split
+        into; each frame draws from its own slice of the pair space, so pairs
+        are unique across all of them.
+        """
+        total = total or start + n
+        part, num_parts = 0, 1
+        if frame_starts is not None:
+            part, num_parts = int(np.searchsorted(frame_starts, start)), len(frame_starts)
+        students, courses = draw_unique_pairs(
+            rng, n,
+            self._popularity_cdf(len(student_ids), self.student_skew, 0),
+            self._popularity_cdf(len(course_ids), self.course_skew, 1),
+            part=part, num_parts=num_parts
+        )
+        window_start = (self.reference_date - np.timedelta64(365, 'D')).astype('datetime64[s]')
+        slots = (np.arange(start, start + n) + rng.random(n)) / total
+        enrollment_timestamp = window_start + (slots * 364 * 86400).astype('timedelta64[s]')
+        enrollment_date = enrollment_timestamp.astype('datetime64[D]')
+        progress_percentage = rng.integers(0, 101, n)
+        # Completion date only for finished enrollments
+        completion_date = enrollment_date + rng.integers(30, 120, n).astype('timedelta64[D]')
+        completion_date[progress_percentage != 100] = np.datetime64('NaT')
+        return pd.DataFrame({
+            'interaction_id': self._ids('interaction_id', start, n),
+            'student_id': self._take(student_ids, students),
+            'course_id': self._take(course_ids, courses),
+            'enrollment_timestamp': enrollment_timestamp,
+            'enrollment_date': enrollment_date,
+            'completion_date': completion_date,
+            'progress_percentage': progress_percentage,
+            'time_spent_hours': rng.integers(1, 100, n),
+            'lessons_completed': rng.integers(0, 50, n),
+            'quizzes_attempted': rng.integers(0, 20, n),
+            'quiz_average_score': rng.integers(60, 100, n),
+            'assignments_submitted': rng.integers(0, 15, n),
+            'assignment_average_score': rng.integers(70, 100, n),
+            'forum_posts': rng.integers(0, 20, n),
+            'help_requests': rng.integers(0, 10, n),
+            'peer_interactions': rng.integers(0, 30, n),
+            'video_watch_time': rng.integers(0, 2400, n),  # minutes
+            'reading_time': rng.integers(0, 1200, n),  # minutes
+            'last_activity_date': days_before(rng, self.reference_date, 0, 30, n),
+            'device_used': categorical(rng, ['Desktop', 'Laptop', 'Tablet', 'Mobile'], n),
+            'session_count': rng.integers(1, 100, n),
+            'average_session_duration': rng.integers(15, 180, n),  # minutes
+            'dropout_risk': (rng.random(n) < 0.2).astype(np.int8),
+            'satisfaction_rating': rng.integers(1, 6, n),
+            'would_recommend': (rng.random(n) < 0.8).astype(np.int8),
+            'certificate_earned': (rng.random(n) < 0.3).astype(np.int8),
+            'final_grade': categorical(rng, ['A', 'B', 'C', 'D', 'F'], n, p=[0.3, 0.3, 0.2, 0.15, 0.05])
+        }, copy=False)
+    
+    def _quiz_frame(self, rng, start, n, course_ids):
+        quiz_numbers = rng.integers(1, 20, n)
+        quiz_kinds = rng.integers(0, len(QUIZ_KINDS), n)
+        return pd.DataFrame({
+            'quiz_id': self._ids('quiz_id', start, n),
+            'course_id': self._take(course_ids, rng.integers(0, len(course_ids), n)),
+            'title': pd.Categorical.from_codes(
+                (quiz_numbers - 1) * len(QUIZ_KINDS) + quiz_kinds,
+                categories=[f'Quiz {number} - {kind}' for number in range(1, 20) for kind in QUIZ_KINDS]
+            ),
+            'description': pd.Categorical.from_codes(
+                np.zeros(n, dtype=np.int8), categories=['Assessment to test understanding of course concepts']
+            ),
+            'question_count': rng.integers(5, 30, n),
+            'time_limit_minutes': rng.integers(15, 120, n),
+            'max_attempts': rng.integers(1, 5, n),
+            'passing_score': rng.integers(60, 80, n),
+            'difficulty_level': categorical(rng, ['Easy', 'Medium', 'Hard'], n),
+            'question_types': self._lists(rng, 'question_types', 1, 4, n),
+            'topics_covered': self._lists(rng, 'topics_covered', 1, 3, n),
+            'created_date': days_before(rng, self.reference_date, 30, 365, n),
+            'is_active': rng.random(n) < 0.9,
+            'auto_graded': rng.random(n) < 0.8,
+            'randomize_questions': rng.random(n) < 0.6,
+            'show_correct_answers': rng.random(n) < 0.7,
+            'average_score': rng.integers(65, 95, n),
+            'completion_rate': np.round(rng.uniform(0.7, 0.98, n), 2),
+            'average_time_taken': rng.integers(20, 90, n)  # minutes
+        }, copy=False)
+    
     def generate_student_dataset(self, num_students=1000):
         """Generate comprehensive student dataset"""
-        np.random.seed(42)
-        
-        students = []
-        for i in range(num_students):
-            student = {
-                'student_id': f'STU_{i+1:04d}',
-                'name': f'Student {i+1}',
-                'email': f'student{i+1}@eduai.com',
-                'age': np.random.randint(18, 45),
-                'gender': np.random.choice(['Male', 'Female', 'Other'], p=[0.45, 0.45, 0.1]),
-                'location': np.random.choice([
-                    'New York', 'California', 'Texas', 'Florida', 'Illinois',
-                    'Pennsylvania', 'Ohio', 'Georgia', 'North Carolina', 'Michigan'
-                ]),
-                'education_level': np.random.choice([
-                    'High School', 'Bachelor\'s', 'Master\'s', 'PhD'
-                ], p=[0.3, 0.4, 0.25, 0.05]),
-                'employment_status': np.random.choice([
-                    'Student', 'Employed', 'Unemployed', 'Self-employed'
-                ], p=[0.4, 0.45, 0.1, 0.05]),
-                'learning_style': np.random.choice([
-                    'Visual', 'Auditory', 'Kinesthetic', 'Reading/Writing'
-                ]),
-                'motivation_level': np.random.randint(1, 11),
-                'tech_proficiency': np.random.choice(self.skill_levels),
-                'preferred_study_time': np.random.choice([
-                    'Morning', 'Afternoon', 'Evening', 'Night'
-                ]),
-                'device_preference': np.random.choice([
-                    'Desktop', 'Laptop', 'Tablet', 'Mobile'
-                ], p=[0.2, 0.5, 0.2, 0.1]),
-                'internet_speed': np.random.choice([
-                    'Slow', 'Medium', 'Fast', 'Very Fast'
-                ], p=[0.1, 0.3, 0.4, 0.2]),
-                'registration_date': (
-                    datetime.now() - timedelta(days=np.random.randint(1, 365))
-                ).strftime('%Y-%m-%d'),
-                'last_login': (
-                    datetime.now() - timedelta(days=np.random.randint(0, 30))
-                ).strftime('%Y-%m-%d'),
-                'total_courses_enrolled': np.random.randint(1, 15),
-                'courses_completed': 0,  # Will be calculated
-                'total_study_hours': np.random.randint(10, 500),
-                'average_session_duration': np.random.randint(15, 180),  # minutes
-                'forum_posts': np.random.randint(0, 50),
-                'help_requests': np.random.randint(0, 20),
-                'peer_interactions': np.random.randint(0, 100),
-                'certificates_earned': np.random.randint(0, 10),
-                'current_streak': np.random.randint(0, 100),
-                'longest_streak': np.random.randint(0, 200),
-                'xp_points': np.random.randint(0, 10000),
-                'level': np.random.randint(1, 50),
-                'badges': np.random.randint(0, 25),
-                'preferred_subjects': random.sample(self.subjects, np.random.randint(1, 4)),
-                'programming_languages_known': random.sample(
-                    self.programming_languages, np.random.randint(0, 4)
-                ),
-                'career_goals': np.random.choice([
-                    'Software Developer', 'Data Scientist', 'Web Designer',
-                    'Product Manager', 'Teacher', 'Researcher', 'Entrepreneur'
-                ]),
-                'satisfaction_score': np.random.randint(1, 11),
-                'recommendation_score': np.random.randint(1, 11)
-            }
-            
-            # Calculate completed courses based on enrollment
-            student['courses_completed'] = min(
-                student['total_courses_enrolled'],
-                np.random.randint(0, student['total_courses_enrolled'] + 1)
-            )
-            
-            students.append(student)
-        
-        return pd.DataFrame(students)
+        return self._student_frame(np.random.default_rng(self.seed), 0, num_students)
     
     def generate_course_dataset(self, num_courses=200):
         """Generate comprehensive course dataset"""
-        np.random.seed(42)
+        return self._course_frame(np.random.default_rng(self.seed), 0, num_courses)
+    
+    def generate_interaction_dataset(self, students_df, courses_df, num_interactions=5000):
+        """Generate student-course interaction dataset with unique, time-ordered enrollments"""
+        return self._interaction_frame(
+            np.random.default_rng(self.seed), 0, num_interactions,
+            students_df['student_id'].to_numpy(), courses_df['course_id'].to_numpy()
+        )
+    
+    def generate_quiz_dataset(self, courses_df, num_quizzes=500):
+        """Generate quiz and assessment dataset"""
+        return self._quiz_frame(np.random.default_rng(self.seed), 0, num_quizzes, courses_df['course_id'].to_numpy())
+    
+    def _iter_chunks(self, make_frame, total, chunk_size, *args):
+        # One generator stream per dataset, advancing across chunks
+        rng = np.random.default_rng(self.seed)
+        for start in range(0, total, chunk_size):
+            yield make_frame(rng, start, min(chunk_size, total - start), *args)
+    
+    def iter_student_chunks(self, num_students, chunk_size=50000):
+        """Yield the student dataset as DataFrames of at most chunk_size rows"""
+        return self._iter_chunks(self._student_frame, num_students, chunk_size)
+    
+    def iter_course_chunks(self, num_courses, chunk_size=50000):
+        """Yield the course dataset as DataFrames of at most chunk_size rows"""
+        return self._iter_chunks(self._course_frame, num_courses, chunk_size)
+    
+    def iter_interaction_chunks(self, num_students, num_courses, num_interactions, chunk_size=50000):
+        """Yield interactions referencing STU_/CRS_ ids without materialising either id list
         
-        course_titles = [
-            'Introduction to Python Programming',
-            'Advanced JavaScript Concepts',
-            'Data Science with R',
-            'Machine Learning Fundamentals',
-            'Web Development Bootcamp',
-            'Mobile App Development',
-            'Database Design and Management',
-            'Cybersecurity Essentials',
-            'Digital Marketing Strategy',
-            'UI/UX Design Principles',
-            'Cloud Computing with AWS',
-            'Artificial Intelligence Basics',
-            'Blockchain Technology',
-            'DevOps and CI/CD',
-            'React.js Complete Guide',
-            'Node.js Backend Development',
-            'Data Visualization with D3.js',
-            'Statistics for Data Science',
-            'Linear Algebra for ML',
-            'Computer Vision Fundamentals'
-        ]
+        (student, course) pairs are unique across the whole dataset: every chunk
+        draws from a disjoint slice of the pair space.
+        """
+        return self._iter_chunks(
+            self._interaction_frame, num_interactions, chunk_size,
+            IdSpace('STU_', num_students, 4), IdSpace('CRS_', num_courses, 4), num_interactions,
+            np.arange(0, num_interactions, chunk_size)
+        )
+    
+    def iter_quiz_chunks(self, num_courses, num_quizzes, chunk_size=50000):
+        """Yield quizzes referencing CRS_ ids without materialising the course list"""
+        return self._iter_chunks(self._quiz_frame, num_quizzes, chunk_size, IdSpace('CRS_', num_courses, 4))
+    
+    def _append_chunks(self, chunks, output_dir, name, on_chunk, formats):
+        writers = [ChunkWriter(output_dir, name, fmt) for fmt in formats]
+        rows = 0
+        try:
+            for chunk in chunks:
+                output = self.expand_compact(chunk)
+                for writer in writers:
+                    writer.append(output)
+                on_chunk(chunk)
+                rows += len(chunk)
+        finally:
+            for writer in writers:
+                writer.close()
+        return rows
+    
+    def save_datasets_streaming(self, output_dir='datasets', num_students=1000, num_courses=200,
+                                num_interactions=5000, num_quizzes=500, chunk_size=50000,
+                                formats=('csv', 'json')):
+        """Generate and save all datasets chunk by chunk with bounded memory"""
+        os.makedirs(output_dir, exist_ok=True)
+        stats = StreamingSummary()
         
-        instructors = [
-            'Dr. Sarah Johnson', 'Prof. Michael Chen', 'Dr. Emily Rodriguez',
-            'James Wilson', 'Lisa Park', 'David Kim', 'Maria Garcia',
-            'Robert Taylor', 'Jennifer Lee', 'Alex Thompson'
-        ]
+        def student_stats(chunk):
+            stats.update_numeric('age', chunk['age'])
+            for column in ('education_level', 'location', 'learning_style'):
+                stats.update_counts(column, chunk[column])
         
-        categories = [
-            'Programming', 'Data Science', 'Web Development', 'Mobile Development',
-            'Machine Learning', 'Cybersecurity', 'Design', 'Business', 'Mathematics'
-        ]
+        def course_stats(chunk):
+            stats.update_counts('category', chunk['category'])
+            stats.update_counts('level', chunk['level'])
+            stats.update_numeric('price', chunk['price'])
+            stats.update_numeric('rating', chunk['rating'])
         
-        courses = []
-        for i in range(num_courses):
-            base_title = np.random.choice(course_titles)
-            course = {
-                'course_id': f'CRS_{i+1:04d}',
-                'title': f'{base_title} - Level {np.random.randint(1, 4)}',
-                'description': f'Comprehensive course covering {base_title.lower()} concepts and practical applications.',
-                'instructor': np.random.choice(instructors),
-                'category': np.random.choice(categories),
-                'subcategory': f'{np.random.choice(categories)} Specialization',
-                'level': np.random.choice(self.skill_levels),
-                'duration_weeks': np.random.randint(4, 16),
-                'duration_hours': np.random.randint(10, 80),
-                'price': np.random.choice([0, 29, 49, 79, 99, 149, 199]),
-                'currency': 'USD',
-                'language': np.random.choice(['English', 'Spanish', 'French'], p=[0.8, 0.15, 0.05]),
-                'rating': round(np.random.uniform(3.5, 5.0), 1),
-                'num_ratings': np.random.randint(10, 1000),
-                'num_students': np.random.randint(50, 5000),
-                'completion_rate': round(np.random.uniform(0.6, 0.95), 2),
-                'difficulty_score': np.random.randint(1, 10),
-                'prerequisites': random.sample(course_titles, np.random.randint(0, 3)),
-                'learning_outcomes': [
-                    f'Understand {base_title.lower()} fundamentals',
-                    f'Apply {base_title.lower()} in real projects',
-                    f'Master advanced {base_title.lower()} techniques'
-                ],
-                'skills_taught': random.sample(self.programming_languages + self.subjects, np.random.randint(2, 6)),
-                'certificate_available': np.random.choice([True, False], p=[0.8, 0.2]),
-                'hands_on_projects': np.random.randint(1, 8),
-                'quizzes': np.random.randint(5, 20),
-                'assignments': np.random.randint(3, 15),
-                'video_hours': np.random.randint(5, 40),
-                'reading_materials': np.random.randint(10, 50),
-                'forum_discussions': np.random.randint(0, 100),
-                'created_date': (
-                    datetime.now() - timedelta(days=np.random.randint(30, 730))
-                ).strftime('%Y-%m-%d'),
-                'last_updated': (
-                    datetime.now() - timedelta(days=np.random.randint(1, 90))
-                ).strftime('%Y-%m-%d'),
-                'enrollment_status': np.random.choice(['Open', 'Closed', 'Waitlist'], p=[0.7, 0.2, 0.1]),
-                'tags': random.sample([
-                    'beginner-friendly', 'hands-on', 'project-based', 'certification',
-                    'popular', 'trending', 'updated-2024', 'industry-relevant'
-                ], np.random.randint(2, 5))
-            }
-            courses.append(course)
+        def interaction_stats(chunk):
+            for column in ('progress_percentage', 'time_spent_hours', 'quiz_average_score', 'dropout_risk'):
+                stats.update_numeric(column, chunk[column])
         
-        return pd.DataFrame(courses)
-    
-    def generate_interaction_dataset(self, students_df, courses_df, num_interactions=5000):
-        """Generate student-course interaction dataset"""
-        np.random.seed(42)
+        counts = {
+            'students': self._append_chunks(
+                self.iter_student_chunks(num_students, chunk_size), output_dir, 'students', student_stats, formats
+            ),
+            'courses': self._append_chunks(
+                self.iter_course_chunks(num_courses, chunk_size), output_dir, 'courses', course_stats, formats
+            ),
+            'interactions': self._append_chunks(
+                self.iter_interaction_chunks(num_students, num_courses, num_interactions, chunk_size),
+                output_dir, 'interactions', interaction_stats, formats
+            ),
+            'quizzes': self._append_chunks(
+                self.iter_quiz_chunks(num_courses, num_quizzes, chunk_size), output_dir, 'quizzes', lambda chunk: None, formats
+            )
+        }
         
-        interactions = []
-        for i in range(num_interactions):
-            student_id = np.random.choice(students_df['student_id'])
-            course_id = np.random.choice(courses_df['course_id'])
-            
-            interaction = {
-                'interaction_id': f'INT_{i+1:06d}',
-                'student_id': student_id,
-                'course_id': course_id,
-                'enrollment_date': (
-                    datetime.now() - timedelta(days=np.random.randint(1, 365))
-                ).strftime('%Y-%m-%d'),
-                'completion_date': None,
-                'progress_percentage': np.random.randint(0, 101),
-                'time_spent_hours': np.random.randint(1, 100),
-                'lessons_completed': np.random.randint(0, 50),
-                'quizzes_attempted': np.random.randint(0, 20),
-                'quiz_average_score': np.random.randint(60, 100),
-                'assignments_submitted': np.random.randint(0, 15),
-                'assignment_average_score': np.random.randint(70, 100),
-                'forum_posts': np.random.randint(0, 20),
-                'help_requests': np.random.randint(0, 10),
-                'peer_interactions': np.random.randint(0, 30),
-                'video_watch_time': np.random.randint(0, 2400),  # minutes
-                'reading_time': np.random.randint(0, 1200),  # minutes
-                'last_activity_date': (
-                    datetime.now() - timedelta(days=np.random.randint(0, 30))
-                ).strftime('%Y-%m-%d'),
-                'device_used': np.random.choice(['Desktop', 'Laptop', 'Tablet', 'Mobile']),
-                'session_count': np.random.randint(1, 100),
-                'average_session_duration': np.random.randint(15, 180),  # minutes
-                'dropout_risk': np.random.choice([0, 1], p=[0.8, 0.2]),
-                'satisfaction_rating': np.random.randint(1, 6),
-                'would_recommend': np.random.choice([0, 1], p=[0.2, 0.8]),
-                'certificate_earned': np.random.choice([0, 1], p=[0.7, 0.3]),
-                'final_grade': np.random.choice(['A', 'B', 'C', 'D', 'F'], p=[0.3, 0.3, 0.2, 0.15, 0.05])
+        summary = {
+            'dataset_info': {
+                'students_count': counts['students'],
+                'courses_count': counts['courses'],
+                'interactions_count': counts['interactions'],
+                'quizzes_count': counts['quizzes'],
+                'generated_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            },
+            'student_demographics': {
+                'age_distribution': stats.describe('age'),
+                'education_levels': stats.value_counts('education_level'),
+                'locations': stats.value_counts('location'),
+                'learning_styles': stats.value_counts('learning_style')
+            },
+            'course_statistics': {
+                'categories': stats.value_counts('category'),
+                'difficulty_levels': stats.value_counts('level'),
+                'price_distribution': stats.describe('price'),
+                'rating_distribution': stats.describe('rating')
+            },
+            'interaction_metrics': {
+                'completion_rate': stats.mean('progress_percentage'),
+                'average_time_spent': stats.mean('time_spent_hours'),
+                'quiz_performance': stats.mean('quiz_average_score'),
+                'dropout_rate': stats.mean('dropout_risk')
             }
-            
-            # Set completion date if progress is 100%
-            if interaction['progress_percentage'] == 100:
-                enrollment_date = datetime.strptime(interaction['enrollment_date'], '%Y-%m-%d')
-                completion_date = enrollment_date + timedelta(days=np.random.randint(30, 120))
-                interaction['completion_date'] = completion_date.strftime('%Y-%m-%d')
-            
-            interactions.append(interaction)
+        }
         
-        return pd.DataFrame(interactions)
+        with open(f'{output_dir}/dataset_summary.json', 'w') as f:
+            json.dump(summary, f, indent=2)
+        
+        print(f"Datasets streamed to {output_dir}/")
+        print(f"Summary: {counts['students']} students, {counts['courses']} courses, {counts['interactions']} interactions, {counts['quizzes']} quizzes")
+        
+        return summary
     
-    def generate_quiz_dataset(self, courses_df, num_quizzes=500):
-        """Generate quiz and assessment dataset"""
-        np.random.seed(42)
+    def generate_sharded(self, output_dir='datasets', num_students=1000, num_courses=200,
+                         num_interactions=5000, num_quizzes=500, num_shards=4, workers=None,
+                         chunk_size=50000, fmt=None):
+        """Generate every dataset as independent shard files on a process pool
+        
+        Each shard draws from its own stream spawned from SeedSequence(self.seed),
+        so the output depends only on the seed, reference date and shard count,
+        never on the number of workers or the order shards finish in.
+        """
+        fmt = fmt or ('parquet' if pa is not None else 'csv')
+        def shard_bounds(total):
+            # Contiguous row ranges so ids stay sequential across shards
+            return np.linspace(0, total, num_shards + 1).astype(int)
+        
+        # First row of every chunk of every shard; each gets its own slice of the pair space
+        interaction_bounds = shard_bounds(num_interactions)
+        interaction_frames = np.concatenate([
+            np.arange(interaction_bounds[shard], interaction_bounds[shard + 1], chunk_size)
+            for shard in range(num_shards)
+        ])
+        students, courses = IdSpace('STU_', num_students, 4), IdSpace('CRS_', num_courses, 4)
+        datasets = [
+            ('students', '_student_frame', num_students, ()),
+            ('courses', '_course_frame', num_courses, ()),
+            ('interactions', '_interaction_frame', num_interactions,
+             (students, courses, num_interactions, interaction_frames)),
+            ('quizzes', '_quiz_frame', num_quizzes, (courses,))
+        ]
+        dataset_seeds = np.random.SeedSequence(self.seed).spawn(len(datasets))
         
-        question_types = ['multiple_choice', 'true_false', 'short_answer', 'essay', 'coding']
-        difficulty_levels = ['Easy', 'Medium', 'Hard']
+        jobs = []
+        for (name, builder, total, references), dataset_seed in zip(datasets, dataset_seeds):
+            os.makedirs(f'{output_dir}/{name}', exist_ok=True)
+            bounds = shard_bounds(total)
+            for shard, shard_seed in enumerate(dataset_seed.spawn(num_shards)):
+                jobs.append((name, shard, (
+                    self, builder, shard_seed, int(bounds[shard]), int(bounds[shard + 1] - bounds[shard]),
+                    references, f'{output_dir}/{name}', f'part-{shard:05d}', fmt, chunk_size
+                )))
         
-        quizzes = []
-        for i in range(num_quizzes):
-            course_id = np.random.choice(courses_df['course_id'])
-            
-            quiz = {
-                'quiz_id': f'QUZ_{i+1:04d}',
-                'course_id': course_id,
-                'title': f'Quiz {np.random.randint(1, 20)} - {np.random.choice(["Fundamentals", "Advanced", "Practice", "Final"])}',
-                'description': 'Assessment to test understanding of course concepts',
-                'question_count': np.random.randint(5, 30),
-                'time_limit_minutes': np.random.randint(15, 120),
-                'max_attempts': np.random.randint(1, 5),
-                'passing_score': np.random.randint(60, 80),
-                'difficulty_level': np.random.choice(difficulty_levels),
-                'question_types': random.sample(question_types, np.random.randint(1, 4)),
-                'topics_covered': random.sample(self.subjects, np.random.randint(1, 3)),
-                'created_date': (
-                    datetime.now() - timedelta(days=np.random.randint(30, 365))
-                ).strftime('%Y-%m-%d'),
-                'is_active': np.random.choice([True, False], p=[0.9, 0.1]),
-                'auto_graded': np.random.choice([True, False], p=[0.8, 0.2]),
-                'randomize_questions': np.random.choice([True, False], p=[0.6, 0.4]),
-                'show_correct_answers': np.random.choice([True, False], p=[0.7, 0.3]),
-                'average_score': np.random.randint(65, 95),
-                'completion_rate': round(np.random.uniform(0.7, 0.98), 2),
-                'average_time_taken': np.random.randint(20, 90)  # minutes
+        started = datetime.now()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [(name, shard, pool.submit(_write_shard, *args)) for name, shard, args in jobs]
+            rows = {}
+            for name, shard, future in futures:
+                rows.setdefault(name, []).append(future.result())
+        
+        extension = 'jsonl' if fmt == 'json' else fmt
+        manifest = {
+            'seed': self.seed,
+            'reference_date': str(self.reference_date),
+            'num_shards': num_shards,
+            'format': fmt,
+            'datasets': {
+                name: {
+                    'rows': int(sum(shard_rows)),
+                    'shards': [
+                        {'file': f'{name}/part-{shard:05d}.{extension}', 'rows': int(count)}
+                        for shard, count in enumerate(shard_rows)
+                    ]
+                }
+                for name, shard_rows in rows.items()
             }
-            quizzes.append(quiz)
+        }
+        with open(f'{output_dir}/manifest.json', 'w') as f:
+            json.dump(manifest, f, indent=2)
+        
+        elapsed = (datetime.now() - started).total_seconds()
+        print(f"Generated {num_shards} shards per dataset in {output_dir}/ in {elapsed:.1f}s")
         
-        return pd.DataFrame(quizzes)
+        return manifest
     
-    def save_datasets(self, output_dir='datasets'):
+    def save_datasets(self, output_dir='datasets', formats=('csv', 'json')):
         """Generate and save all datasets"""
-        import os
         os.makedirs(output_dir, exist_ok=True)
         
         # Generate datasets
@@ -284,17 +820,11 @@ class EducationDatasetGenerator:
         interactions_df = self.generate_interaction_dataset(students_df, courses_df, 5000)
         quizzes_df = self.generate_quiz_dataset(courses_df, 500)
         
-        # Save as CSV
-        students_df.to_csv(f'{output_dir}/students.csv', index=False)
-        courses_df.to_csv(f'{output_dir}/courses.csv', index=False)
-        interactions_df.to_csv(f'{output_dir}/interactions.csv', index=False)
-        quizzes_df.to_csv(f'{output_dir}/quizzes.csv', index=False)
-        
-        # Save as JSON
-        students_df.to_json(f'{output_dir}/students.json', orient='records', indent=2)
-        courses_df.to_json(f'{output_dir}/courses.json', orient='records', indent=2)
-        interactions_df.to_json(f'{output_dir}/interactions.json', orient='records', indent=2)
-        quizzes_df.to_json(f'{output_dir}/quizzes.json', orient='records', indent=2)
+        # Save in every requested format
+        write_dataset(self.expand_compact(students_df), output_dir, 'students', formats)
+        write_dataset(self.expand_compact(courses_df), output_dir, 'courses', formats)
+        write_dataset(self.expand_compact(interactions_df), output_dir, 'interactions', formats)
+        write_dataset(self.expand_compact(quizzes_df), output_dir, 'quizzes', formats)
         
         # Generate summary statistics
         summary = {
@@ -340,5 +870,39 @@ class EducationDatasetGenerator:
         }
 
 if __name__ == "__main__":
-    generator = EducationDatasetGenerator()
-    datasets = generator.save_datasets()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Generate synthetic education datasets')
+    parser.add_argument('--output-dir', default='datasets')
+    parser.add_argument('--stream', action='store_true', help='write in fixed-size chunks with bounded memory')
+    parser.add_argument('--students', type=int, default=1000)
+    parser.add_argument('--courses', type=int, default=200)
+    parser.add_argument('--interactions', type=int, default=5000)
+    parser.add_argument('--quizzes', type=int, default=500)
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('--formats', nargs='+', choices=OUTPUT_FORMATS, default=['csv', 'json'])
+    parser.add_argument('--shards', type=int, default=0, help='write N shard files per dataset on a process pool')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--reference-date', default=None, help='YYYY-MM-DD all dates are relative to')
+    parser.add_argument('--student-skew', type=float, default=0.8, help='Zipf exponent of student activity (0 = uniform)')
+    parser.add_argument('--course-skew', type=float, default=1.1, help='Zipf exponent of course popularity (0 = uniform)')
+    parser.add_argument('--compact', action='store_true', help='keep ids and list columns as integers until output')
+    args = parser.parse_args()
+    
+    generator = EducationDatasetGenerator(
+        seed=args.seed, reference_date=args.reference_date,
+        student_skew=args.student_skew, course_skew=args.course_skew, compact=args.compact
+    )
+    if args.shards:
+        generator.generate_sharded(
+            args.output_dir, args.students, args.courses, args.interactions, args.quizzes,
+            args.shards, args.workers, args.chunk_size, args.formats[0]
+        )
+    elif args.stream:
+        generator.save_datasets_streaming(
+            args.output_dir, args.students, args.courses, args.interactions, args.quizzes, args.chunk_size,
+            args.formats
+        )
+    else:
+        datasets = generator.save_datasets(args.output_dir, args.formats)
@@ -0,0 +1,369 @@
+"""Seeded equivalence checks of the vectorized generators against the legacy per-row logic
+
+The legacy generators below are the original row-at-a-time implementations,
+with `datetime.now()` pinned to the reference date and the global RNGs
+replaced by seeded instances. Both sides draw from different streams, so the
+checks are statistical: same columns and dtype families, values inside the
+legacy ranges, and matching means and category proportions within tolerance.
+"""
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from education_data_generator import (
+    COURSE_TAGS, COURSE_TITLES, CATEGORIES, INSTRUCTORS, LOCATIONS, QUESTION_TYPES, QUIZ_KINDS,
+    EducationDatasetGenerator
+)
+
+SEED = 7
+REFERENCE_DATE = '2025-06-30'
+NOW = datetime.strptime(REFERENCE_DATE, '%Y-%m-%d')
+SIZES = {'students': 3000, 'courses': 1000, 'interactions': 5000, 'quizzes': 2000}
+
+# Allowed gap between means or category shares, in standard errors of the difference
+TOLERANCE = 5
+
+# Allowed overshoot of the legacy sample's min / max, as a share of its span
+RANGE_SLACK = 0.02
+
+# Foreign keys are checked against the referenced dataset instead; interactions
+# deliberately follow Zipf popularity rather than the legacy uniform draw
+REFERENCE_COLUMNS = {'interactions': {'student_id', 'course_id'}, 'quizzes': {'course_id'}}
+# Columns the vectorized generator adds
+ADDED_COLUMNS = {'interactions': {'enrollment_timestamp'}}
+
+
+def days_ago(rs, low, high):
+    return (NOW - timedelta(days=int(rs.randint(low, high)))).strftime('%Y-%m-%d')
+
+
+class LegacyGenerator:
+    """Row-at-a-time generation as it was before vectorization"""
+
+    def __init__(self, seed):
+        self.rs = np.random.RandomState(seed)
+        self.py = random.Random(seed)
+        self.subjects = EducationDatasetGenerator().subjects
+        self.programming_languages = EducationDatasetGenerator().programming_languages
+        self.skill_levels = ['Beginner', 'Intermediate', 'Advanced', 'Expert']
+
+    def students(self, num_students):
+        rs, py = self.rs, self.py
+        students = []
+        for i in range(num_students):
+            student = {
+                'student_id': f'STU_{i+1:04d}',
+                'name': f'Student {i+1}',
+                'email': f'student{i+1}@eduai.com',
+                'age': rs.randint(18, 45),
+                'gender': rs.choice(['Male', 'Female', 'Other'], p=[0.45, 0.45, 0.1]),
+                'location': rs.choice(LOCATIONS),
+                'education_level': rs.choice(['High School', 'Bachelor\'s', 'Master\'s', 'PhD'], p=[0.3, 0.4, 0.25, 0.05]),
+                'employment_status': rs.choice(['Student', 'Employed', 'Unemployed', 'Self-employed'], p=[0.4, 0.45, 0.1, 0.05]),
+                'learning_style': rs.choice(['Visual', 'Auditory', 'Kinesthetic', 'Reading/Writing']),
+                'motivation_level': rs.randint(1, 11),
+                'tech_proficiency': rs.choice(self.skill_levels),
+                'preferred_study_time': rs.choice(['Morning', 'Afternoon', 'Evening', 'Night']),
+                'device_preference': rs.choice(['Desktop', 'Laptop', 'Tablet', 'Mobile'], p=[0.2, 0.5, 0.2, 0.1]),
+                'internet_speed': rs.choice(['Slow', 'Medium', 'Fast', 'Very Fast'], p=[0.1, 0.3, 0.4, 0.2]),
+                'registration_date': days_ago(rs, 1, 365),
+                'last_login': days_ago(rs, 0, 30),
+                'total_courses_enrolled': rs.randint(1, 15),
+                'courses_completed': 0,
+                'total_study_hours': rs.randint(10, 500),
+                'average_session_duration': rs.randint(15, 180),
+                'forum_posts': rs.randint(0, 50),
+                'help_requests': rs.randint(0, 20),
+                'peer_interactions': rs.randint(0, 100),
+                'certificates_earned': rs.randint(0, 10),
+                'current_streak': rs.randint(0, 100),
+                'longest_streak': rs.randint(0, 200),
+                'xp_points': rs.randint(0, 10000),
+                'level': rs.randint(1, 50),
+                'badges': rs.randint(0, 25),
+                'preferred_subjects': py.sample(self.subjects, rs.randint(1, 4)),
+                'programming_languages_known': py.sample(self.programming_languages, rs.randint(0, 4)),
+                'career_goals': rs.choice([
+                    'Software Developer', 'Data Scientist', 'Web Designer',
+                    'Product Manager', 'Teacher', 'Researcher', 'Entrepreneur'
+                ]),
+                'satisfaction_score': rs.randint(1, 11),
+                'recommendation_score': rs.randint(1, 11)
+            }
+            student['courses_completed'] = min(
+                student['total_courses_enrolled'], rs.randint(0, student['total_courses_enrolled'] + 1)
+            )
+            students.append(student)
+        return pd.DataFrame(students)
+
+    def courses(self, num_courses):
+        rs, py = self.rs, self.py
+        courses = []
+        for i in range(num_courses):
+            base_title = rs.choice(COURSE_TITLES)
+            courses.append({
+                'course_id': f'CRS_{i+1:04d}',
+                'title': f'{base_title} - Level {rs.randint(1, 4)}',
+                'description': f'Comprehensive course covering {base_title.lower()} concepts and practical applications.',
+                'instructor': rs.choice(INSTRUCTORS),
+                'category': rs.choice(CATEGORIES),
+                'subcategory': f'{rs.choice(CATEGORIES)} Specialization',
+                'level': rs.choice(self.skill_levels),
+                'duration_weeks': rs.randint(4, 16),
+                'duration_hours': rs.randint(10, 80),
+                'price': rs.choice([0, 29, 49, 79, 99, 149, 199]),
+                'currency': 'USD',
+                'language': rs.choice(['English', 'Spanish', 'French'], p=[0.8, 0.15, 0.05]),
+                'rating': round(rs.uniform(3.5, 5.0), 1),
+                'num_ratings': rs.randint(10, 1000),
+                'num_students': rs.randint(50, 5000),
+                'completion_rate': round(rs.uniform(0.6, 0.95), 2),
+                'difficulty_score': rs.randint(1, 10),
+                'prerequisites': py.sample(COURSE_TITLES, rs.randint(0, 3)),
+                'learning_outcomes': [
+                    f'Understand {base_title.lower()} fundamentals',
+                    f'Apply {base_title.lower()} in real projects',
+                    f'Master advanced {base_title.lower()} techniques'
+                ],
+                'skills_taught': py.sample(self.programming_languages + self.subjects, rs.randint(2, 6)),
+                'certificate_available': rs.choice([True, False], p=[0.8, 0.2]),
+                'hands_on_projects': rs.randint(1, 8),
+                'quizzes': rs.randint(5, 20),
+                'assignments': rs.randint(3, 15),
+                'video_hours': rs.randint(5, 40),
+                'reading_materials': rs.randint(10, 50),
+                'forum_discussions': rs.randint(0, 100),
+                'created_date': days_ago(rs, 30, 730),
+                'last_updated': days_ago(rs, 1, 90),
+                'enrollment_status': rs.choice(['Open', 'Closed', 'Waitlist'], p=[0.7, 0.2, 0.1]),
+                'tags': py.sample(COURSE_TAGS, rs.randint(2, 5))
+            })
+        return pd.DataFrame(courses)
+
+    def interactions(self, students_df, courses_df, num_interactions):
+        rs = self.rs
+        interactions = []
+        for i in range(num_interactions):
+            interaction = {
+                'interaction_id': f'INT_{i+1:06d}',
+                'student_id': rs.choice(students_df['student_id']),
+                'course_id': rs.choice(courses_df['course_id']),
+                'enrollment_date': days_ago(rs, 1, 365),
+                'completion_date': None,
+                'progress_percentage': rs.randint(0, 101),
+                'time_spent_hours': rs.randint(1, 100),
+                'lessons_completed': rs.randint(0, 50),
+                'quizzes_attempted': rs.randint(0, 20),
+                'quiz_average_score': rs.randint(60, 100),
+                'assignments_submitted': rs.randint(0, 15),
+                'assignment_average_score': rs.randint(70, 100),
+                'forum_posts': rs.randint(0, 20),
+                'help_requests': rs.randint(0, 10),
+                'peer_interactions': rs.randint(0, 30),
+                'video_watch_time': rs.randint(0, 2400),
+                'reading_time': rs.randint(0, 1200),
+                'last_activity_date': days_ago(rs, 0, 30),
+                'device_used': rs.choice(['Desktop', 'Laptop', 'Tablet', 'Mobile']),
+                'session_count': rs.randint(1, 100),
+                'average_session_duration': rs.randint(15, 180),
+                'dropout_risk': rs.choice([0, 1], p=[0.8, 0.2]),
+                'satisfaction_rating': rs.randint(1, 6),
+                'would_recommend': rs.choice([0, 1], p=[0.2, 0.8]),
+                'certificate_earned': rs.choice([0, 1], p=[0.7, 0.3]),
+                'final_grade': rs.choice(['A', 'B', 'C', 'D', 'F'], p=[0.3, 0.3, 0.2, 0.15, 0.05])
+            }
+            if interaction['progress_percentage'] == 100:
+                enrollment_date = datetime.strptime(interaction['enrollment_date'], '%Y-%m-%d')
+                completion_date = enrollment_date + timedelta(days=int(rs.randint(30, 120)))
+                interaction['completion_date'] = completion_date.strftime('%Y-%m-%d')
+            interactions.append(interaction)
+        return pd.DataFrame(interactions)
+
+    def quizzes(self, courses_df, num_quizzes):
+        rs, py = self.rs, self.py
+        quizzes = []
+        for i in range(num_quizzes):
+            quizzes.append({
+                'quiz_id': f'QUZ_{i+1:04d}',
+                'course_id': rs.choice(courses_df['course_id']),
+                'title': f'Quiz {rs.randint(1, 20)} - {rs.choice(QUIZ_KINDS)}',
+                'description': 'Assessment to test understanding of course concepts',
+                'question_count': rs.randint(5, 30),
+                'time_limit_minutes': rs.randint(15, 120),
+                'max_attempts': rs.randint(1, 5),
+                'passing_score': rs.randint(60, 80),
+                'difficulty_level': rs.choice(['Easy', 'Medium', 'Hard']),
+                'question_types': py.sample(QUESTION_TYPES, rs.randint(1, 4)),
+                'topics_covered': py.sample(self.subjects, rs.randint(1, 3)),
+                'created_date': days_ago(rs, 30, 365),
+                'is_active': rs.choice([True, False], p=[0.9, 0.1]),
+                'auto_graded': rs.choice([True, False], p=[0.8, 0.2]),
+                'randomize_questions': rs.choice([True, False], p=[0.6, 0.4]),
+                'show_correct_answers': rs.choice([True, False], p=[0.7, 0.3]),
+                'average_score': rs.randint(65, 95),
+                'completion_rate': round(rs.uniform(0.7, 0.98), 2),
+                'average_time_taken': rs.randint(20, 90)
+            })
+        return pd.DataFrame(quizzes)
+
+
+@pytest.fixture(scope='module')
+def datasets():
+    legacy = LegacyGenerator(SEED)
+    legacy_students = legacy.students(SIZES['students'])
+    legacy_courses = legacy.courses(SIZES['courses'])
+
+    generator = EducationDatasetGenerator(seed=SEED, reference_date=REFERENCE_DATE)
+    students = generator.generate_student_dataset(SIZES['students'])
+    courses = generator.generate_course_dataset(SIZES['courses'])
+    return {
+        'students': (legacy_students, students),
+        'courses': (legacy_courses, courses),
+        'interactions': (
+            legacy.interactions(legacy_students, legacy_courses, SIZES['interactions']),
+            generator.generate_interaction_dataset(students, courses, SIZES['interactions'])
+        ),
+        'quizzes': (
+            legacy.quizzes(legacy_courses, SIZES['quizzes']),
+            generator.generate_quiz_dataset(courses, SIZES['quizzes'])
+        )
+    }
+
+
+def column_kind(series):
+    """Coarse type of a legacy column, from its values"""
+    values = series.dropna()
+    sample = values.iloc[0]
+    if isinstance(sample, list):
+        return 'list'
+    if isinstance(sample, (bool, np.bool_)):
+        return 'bool'
+    if isinstance(sample, (int, float, np.integer, np.floating)):
+        return 'number'
+    if pd.to_datetime(values, format='%Y-%m-%d', errors='coerce').notna().all():
+        return 'date'
+    return 'text'
+
+
+def has_dtype(kind, series):
+    """Whether a vectorized column stores values of the legacy column's kind"""
+    if kind == 'list':
+        return series.dtype == object and series.map(lambda value: isinstance(value, list)).all()
+    if kind == 'bool':
+        return pd.api.types.is_bool_dtype(series)
+    if kind == 'number':
+        return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+    if kind == 'date':
+        return pd.api.types.is_datetime64_dtype(series)
+    return isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(series)
+
+
+def to_days(dates):
+    return pd.Series(dates.dropna().to_numpy().astype('datetime64[D]').astype(np.int64))
+
+
+def assert_within_range(legacy, new, name):
+    slack = RANGE_SLACK * (legacy.max() - legacy.min())
+    assert legacy.min() - slack <= new.min() and new.max() <= legacy.max() + slack, name
+
+
+def assert_means_close(legacy, new, name):
+    legacy, new = legacy.astype(float), new.astype(float)
+    standard_error = np.sqrt(legacy.var() / len(legacy) + new.var() / len(new))
+    assert abs(legacy.mean() - new.mean()) <= TOLERANCE * standard_error + 1e-9, name
+
+
+def assert_proportions_close(legacy, new, name):
+    legacy_share = legacy.astype(str).value_counts(normalize=True)
+    new_share = new.astype(str).value_counts(normalize=True)
+    assert set(new_share.index) <= set(legacy_share.index), name
+    share = legacy_share.add(new_share, fill_value=0) / 2
+    standard_error = np.sqrt(share * (1 - share) * (1 / len(legacy) + 1 / len(new)))
+    # Constant columns have a zero standard error and nothing to compare
+    gap = (legacy_share.sub(new_share, fill_value=0).abs() / standard_error).fillna(0)
+    assert gap.max() <= TOLERANCE, f'{name}: {gap.idxmax()} differs by {gap.max():.1f} standard errors'
+
+
+@pytest.mark.parametrize('name', list(SIZES))
+def test_columns_and_dtypes_match_legacy(datasets, name):
+    legacy, new = datasets[name]
+    assert set(new.columns) == set(legacy.columns) | ADDED_COLUMNS.get(name, set())
+    assert len(new) == len(legacy)
+    for column in legacy.columns:
+        assert has_dtype(column_kind(legacy[column]), new[column]), f'{column}: {new[column].dtype}'
+
+
+@pytest.mark.parametrize('name', list(SIZES))
+def test_values_match_legacy_distribution(datasets, name):
+    legacy, new = datasets[name]
+    for column in legacy.columns:
+        if column in REFERENCE_COLUMNS.get(name, set()):
+            continue
+        kind = column_kind(legacy[column])
+        if kind == 'number':
+            assert_within_range(legacy[column], new[column], column)
+            assert_means_close(legacy[column], new[column], column)
+        elif kind == 'date':
+            legacy_days, new_days = to_days(pd.to_datetime(legacy[column])), to_days(new[column])
+            # A sparse column (completion dates) is too small a sample to pin its range
+            if len(legacy_days) >= len(legacy) / 2:
+                assert_within_range(legacy_days, new_days, column)
+            assert_means_close(legacy_days, new_days, column)
+        elif kind == 'list':
+            pool = set().union(*legacy[column])
+            assert set().union(*new[column]) <= pool, column
+            assert_proportions_close(legacy[column].map(len), new[column].map(len), column)
+        elif legacy[column].nunique() == len(legacy):
+            # Sequential ids and the strings derived from them match row for row
+            assert list(new[column].astype(str)) == list(legacy[column]), column
+        else:
+            assert_proportions_close(legacy[column], new[column], column)
+
+
+def test_students_complete_at_most_their_enrollments(datasets):
+    _, students = datasets['students']
+    assert (students['courses_completed'] <= students['total_courses_enrolled']).all()
+
+
+def test_course_text_follows_its_title(datasets):
+    _, courses = datasets['courses']
+    base_titles = courses['title'].astype(str).str.rsplit(' - Level ', n=1).str[0]
+    assert base_titles.isin(COURSE_TITLES).all()
+    descriptions = courses['description'].astype(str)
+    assert all(title.lower() in description for title, description in zip(base_titles, descriptions))
+
+
+def test_completion_dates_follow_enrollment(datasets):
+    _, interactions = datasets['interactions']
+    finished = interactions['progress_percentage'] == 100
+    # NaT exactly where the course is unfinished
+    assert (interactions['completion_date'].isna() == ~finished).all()
+    days = (interactions['completion_date'] - interactions['enrollment_date'])[finished].dt.days
+    assert (days >= 30).all() and (days < 120).all()
+    assert (interactions.loc[finished, 'completion_date'] >= interactions.loc[finished, 'enrollment_date']).all()
+
+
+def test_references_point_at_generated_rows(datasets):
+    student_ids = datasets['students'][1]['student_id']
+    course_ids = datasets['courses'][1]['course_id']
+    _, interactions = datasets['interactions']
+    _, quizzes = datasets['quizzes']
+    assert interactions['student_id'].isin(student_ids).all()
+    assert interactions['course_id'].isin(course_ids).all()
+    assert not interactions.duplicated(['student_id', 'course_id']).any()
+    assert quizzes['course_id'].isin(course_ids).all()
+    # Uniform like the legacy draw: every course gets about its share of quizzes
+    assert quizzes['course_id'].value_counts().max() <= 5 * len(quizzes) / len(course_ids)
+
+
+def test_generation_is_reproducible():
+    first = EducationDatasetGenerator(seed=SEED, reference_date=REFERENCE_DATE).generate_quiz_dataset(
+        pd.DataFrame({'course_id': ['CRS_0001', 'CRS_0002']}), 200
+    )
+    second = EducationDatasetGenerator(seed=SEED, reference_date=REFERENCE_DATE).generate_quiz_dataset(
+        pd.DataFrame({'course_id': ['CRS_0001', 'CRS_0002']}), 200
+    )
+    pd.testing.assert_frame_equal(first, second)
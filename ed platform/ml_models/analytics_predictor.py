@@ -1,24 +1,265 @@
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingClassifier
-from sklearn.model_selection import train_test_split
+from sklearn.ensemble import (
+    RandomForestRegressor, GradientBoostingClassifier,
+    HistGradientBoostingRegressor, HistGradientBoostingClassifier
+)
+from sklearn.linear_model import SGDRegressor, SGDClassifier
+from sklearn.model_selection import train_test_split, GridSearchCV, KFold, StratifiedKFold
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.metrics import mean_squared_error, accuracy_score
+import os
 import json
 import sys
+import time
+import hashlib
+import argparse
+import operator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+from model_store import ModelArtifactStore
+from dataset_loader import find_dataset, dataset_columns, load_dataset
+from feature_store import FeatureStore
+from tree_compiler import compile_model
+from caching import stable_hash
+
+# Rule tables shared by the single-student and batch paths. Each rule is
+# (signal, comparison, threshold, output); 'performance' and 'dropout' refer to
+# the model predictions, anything else to a student feature (missing -> 0).
+COMPARISONS = {'<': operator.lt, '>': operator.gt}
+
+INSIGHT_RULES = [
+    ('performance', '<', 60, "Performance is below average. Consider increasing study time or seeking help."),
+    ('performance', '>', 80, "Excellent performance predicted! Keep up the great work."),
+    ('dropout', '>', 0.5, "High risk of dropout detected. Immediate intervention recommended."),
+    ('study_hours_per_week', '<', 10, "Low study hours may impact performance. Consider increasing study time."),
+    ('assignment_submission_rate', '<', 0.7, "Low assignment submission rate is concerning. Focus on completing assignments."),
+    ('login_frequency', '<', 3, "Infrequent platform usage. Regular engagement improves outcomes.")
+]
+
+RECOMMENDATION_RULES = [
+    ('dropout', '>', 0.5, {
+        'priority': 'High',
+        'action': 'Schedule mentoring session',
+        'description': 'Connect with academic advisor for personalized support'
+    }),
+    ('study_hours_per_week', '<', 15, {
+        'priority': 'Medium',
+        'action': 'Increase study time',
+        'description': 'Aim for 15-20 hours per week for optimal results'
+    }),
+    ('forum_participation', '<', 2, {
+        'priority': 'Low',
+        'action': 'Engage with community',
+        'description': 'Participate in forums to enhance learning through peer interaction'
+    }),
+    ('video_completion_rate', '<', 0.8, {
+        'priority': 'Medium',
+        'action': 'Complete video lessons',
+        'description': 'Finish watching all video content for better understanding'
+    }),
+    ('performance', '>', 85, {
+        'priority': 'Low',
+        'action': 'Consider advanced courses',
+        'description': 'You\'re excelling! Try more challenging content to continue growing'
+    })
+]
+
+# Raw columns read from a training dataset file (column projection)
+TRAINING_COLUMNS = [
+    'age', 'previous_education', 'study_hours_per_week', 'courses_enrolled',
+    'login_frequency', 'assignment_submission_rate', 'forum_participation',
+    'video_completion_rate', 'quiz_attempts', 'help_seeking_behavior',
+    'peer_interaction_score', 'mobile_usage_ratio', 'weekend_activity',
+    'procrastination_score', 'performance_score', 'dropout_risk'
+]
+
+# Raw student fields the predictions depend on (prediction cache key)
+STUDENT_FEATURES = [column for column in TRAINING_COLUMNS if column not in ('performance_score', 'dropout_risk')]
+
+# datasets/education_data_generator.py columns read by normalize_generated_students
+GENERATED_STUDENT_COLUMNS = [
+    'student_id', 'age', 'education_level', 'motivation_level', 'device_preference', 'registration_date',
+    'last_login', 'total_courses_enrolled', 'total_study_hours', 'forum_posts', 'help_requests', 'peer_interactions'
+]
+GENERATED_INTERACTION_COLUMNS = [
+    'student_id', 'assignments_submitted', 'video_watch_time', 'quizzes_attempted', 'quiz_average_score',
+    'session_count', 'device_used', 'dropout_risk'
+]
+GENERATED_EDUCATION = {'High School': 'high_school', "Bachelor's": 'bachelor', "Master's": 'master', 'PhD': 'master'}
+
+def normalize_generated_students(students_df, interactions_df):
+    """Map generated students and their interactions onto TRAINING_COLUMNS
+    
+    Weekly rates divide totals by the weeks since registration, and the
+    targets come from the student's enrollments: performance is the mean quiz
+    score, dropout risk is set if any enrollment is at risk. Students without
+    interactions have no targets and are dropped. weekend_activity has no
+    generator counterpart and is set to the synthetic dataset's mean.
+    """
+    students = students_df.copy()
+    reference_date = pd.to_datetime(students['last_login']).max()
+    weeks = ((reference_date - pd.to_datetime(students['registration_date'])).dt.days / 7).clip(lower=1)
+    
+    interactions = interactions_df.assign(
+        assignment_rate=(interactions_df['assignments_submitted'] / 14).clip(0, 1),
+        video_rate=(interactions_df['video_watch_time'] / 2400).clip(0, 1),
+        mobile=(interactions_df['device_used'].astype(str) == 'Mobile').astype(float)
+    ).groupby('student_id', observed=True).agg(
+        assignment_submission_rate=('assignment_rate', 'mean'),
+        video_completion_rate=('video_rate', 'mean'),
+        quizzes=('quizzes_attempted', 'sum'),
+        sessions=('session_count', 'sum'),
+        mobile_usage_ratio=('mobile', 'mean'),
+        performance_score=('quiz_average_score', 'mean'),
+        dropout_risk=('dropout_risk', 'max')
+    )
+    
+    df = pd.DataFrame({
+        'student_id': students['student_id'],
+        'age': students['age'],
+        'previous_education': students['education_level'].astype(str).map(GENERATED_EDUCATION).fillna('high_school'),
+        'study_hours_per_week': (students['total_study_hours'] / weeks).clip(1, 40),
+        'courses_enrolled': students['total_courses_enrolled'],
+        'forum_participation': students['forum_posts'] / weeks,
+        'help_seeking_behavior': students['help_requests'] / weeks,
+        'peer_interaction_score': (students['peer_interactions'] / 10).clip(0, 10),
+        'weekend_activity': 1 / 3,
+        # Low motivation stands in for procrastination (both on a 1-10 scale)
+        'procrastination_score': 11 - students['motivation_level'],
+        'weeks': weeks
+    }).join(interactions, on='student_id', how='inner')
+    
+    df['login_frequency'] = (df['sessions'] / df['weeks']).clip(1, 7)
+    df['quiz_attempts'] = df['quizzes'] / df['weeks']
+    return df.drop(columns=['weeks', 'sessions', 'quizzes']).reset_index(drop=True)
+
+def load_training_dataset(path):
+    """Load a training dataset file, mapping generator output onto the predictor's columns
+    
+    A generated students file is joined with the interactions file next to it.
+    Raises ValueError naming any training columns that are still missing.
+    """
+    columns = dataset_columns(path)
+    if 'education_level' in columns and 'previous_education' not in columns:
+        interactions_path = find_dataset(os.path.dirname(os.path.abspath(path)), 'interactions')
+        if interactions_path is None:
+            raise ValueError(f"{path} looks like generated students data, but no interactions dataset was found next to it")
+        df = normalize_generated_students(
+            load_dataset(path, GENERATED_STUDENT_COLUMNS), load_dataset(interactions_path, GENERATED_INTERACTION_COLUMNS)
+        )
+    else:
+        df = load_dataset(path, TRAINING_COLUMNS)
+    
+    missing = [column for column in TRAINING_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"{path} is missing training columns: {', '.join(missing)}")
+    return df
+
+def ensemble_models():
+    """Forest regressor and boosted classifier; batch training only"""
+    return (
+        RandomForestRegressor(n_estimators=100, random_state=42),
+        GradientBoostingClassifier(n_estimators=100, random_state=42)
+    )
+
+def hist_models():
+    """Histogram-binned gradient boosting; fast to fit and predict on large datasets"""
+    return (
+        HistGradientBoostingRegressor(random_state=42),
+        HistGradientBoostingClassifier(random_state=42)
+    )
+
+def online_models():
+    """Linear SGD models that can be updated in place with partial_fit"""
+    return (
+        SGDRegressor(random_state=42),
+        SGDClassifier(loss='log_loss', random_state=42)  # log loss for predict_proba
+    )
+
+# Backend name -> factory returning (performance_model, dropout_model)
+MODEL_BACKENDS = {
+    'ensemble': ensemble_models,
+    'hist': hist_models,
+    'online': online_models
+}
+
+DEFAULT_BACKEND = 'ensemble'
+
+DROPOUT_CLASSES = np.array([0, 1])
+
+# Hyperparameter grids searched by `train --search`, per backend and model
+PARAM_GRIDS = {
+    'ensemble': {
+        'performance': {'n_estimators': [100, 200], 'max_depth': [None, 12], 'min_samples_leaf': [1, 5]},
+        'dropout': {'n_estimators': [100, 200], 'learning_rate': [0.05, 0.1], 'max_depth': [3, 5]}
+    },
+    'hist': {
+        'performance': {'learning_rate': [0.05, 0.1], 'max_leaf_nodes': [31, 63], 'l2_regularization': [0.0, 1.0]},
+        'dropout': {'learning_rate': [0.05, 0.1], 'max_leaf_nodes': [31, 63], 'l2_regularization': [0.0, 1.0]}
+    },
+    'online': {
+        'performance': {'alpha': [1e-5, 1e-4, 1e-3], 'penalty': ['l2', 'elasticnet']},
+        'dropout': {'alpha': [1e-5, 1e-4, 1e-3], 'penalty': ['l2', 'elasticnet']}
+    }
+}
+
+SEARCH_SCORING = {'performance': 'neg_mean_squared_error', 'dropout': 'accuracy'}
+
+# Inputs up to this many rows score on the compiled trees; larger batches are
+# faster through sklearn's threaded predict
+COMPILED_MAX_ROWS = 128
+
+def feature_importances(model, columns):
+    """Tree importances, or normalised absolute coefficients for linear models
+    
+    Histogram boosting exposes neither, so it reports no importances.
+    """
+    if hasattr(model, 'feature_importances_'):
+        weights = model.feature_importances_
+    elif hasattr(model, 'coef_'):
+        weights = np.abs(np.ravel(model.coef_))
+        weights = weights / weights.sum() if weights.sum() else weights
+    else:
+        return {}
+    return dict(zip(columns, weights))
+
+def standardize(scaler, X):
+    """StandardScaler.transform without sklearn's per-call validation, same float32 arithmetic"""
+    X = np.array(X, dtype=np.float32)
+    X -= scaler.mean_.astype(np.float32)
+    X /= scaler.scale_.astype(np.float32)
+    return X
+
+def evaluate_rules(rules, signals):
+    """Evaluate a rule table against scalar or array signals, returning one mask per rule"""
+    return [COMPARISONS[op](signals[signal], threshold) for signal, op, threshold, _ in rules]
+
 class LearningAnalyticsPredictor:
-    def __init__(self):
-        self.performance_model = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.dropout_model = GradientBoostingClassifier(n_estimators=100, random_state=42)
-        self.scaler = StandardScaler()
+    def __init__(self, artifact_store=None, backend=DEFAULT_BACKEND, feature_store=None, prediction_cache=None):
+        self.backend = backend
+        self.performance_model, self.dropout_model = MODEL_BACKENDS[backend]()
+        # One scaler per model, each fitted on that model's own training split
+        self.performance_scaler = StandardScaler()
+        self.dropout_scaler = StandardScaler()
         self.label_encoders = {}
-        
-    def generate_synthetic_dataset(self):
+        self.artifact_store = artifact_store or ModelArtifactStore('analytics_predictor')
+        self.feature_store = feature_store or FeatureStore('analytics_predictor')
+        # Last feature store batch the models have learned from
+        self.feature_batch = None
+        # (model, folds, labels digest) -> cross-validation splits
+        self.fold_cache = {}
+        self.model_version = None
+        self.training_results = None
+        # Flattened copies of the fitted tree models for low-latency scoring
+        self.compiled_models = {}
+        # Optional LRUCache memoising predict_student_outcomes
+        self.prediction_cache = prediction_cache
+        
+    def generate_synthetic_dataset(self, n_students=1000):
         """Generate synthetic learning analytics dataset"""
         np.random.seed(42)
-        n_students = 1000
         
         # Student features
         data = {
@@ -93,24 +334,73 @@ class LearningAnalyticsPredictor:
             'weekend_activity', 'procrastination_score'
         ]
         
-        return df[feature_cols]
+        # float32 halves feature memory; tree models split on float32 anyway
+        return df[feature_cols].astype(np.float32)
     
-    def train_models(self):
-        """Train prediction models"""
-        # Generate dataset
-        df = self.generate_synthetic_dataset()
+    def _folds(self, name, y, cv):
+        """Cross-validation splits for a model's labels, computed once and reused"""
+        y = np.ascontiguousarray(y)
+        key = (name, cv, hashlib.sha1(y.tobytes()).hexdigest())
+        if key not in self.fold_cache:
+            # Stratify the classifier so every fold sees both outcomes
+            splitter = StratifiedKFold if name == 'dropout' else KFold
+            self.fold_cache[key] = list(splitter(n_splits=cv, shuffle=True, random_state=42).split(np.zeros(len(y)), y))
+        return self.fold_cache[key]
+    
+    def _fit_model(self, name, model, X, y, param_grid=None, cv=3, n_jobs=None, search_rows=100000):
+        """Fit one model, optionally after a cross-validated grid search
+        
+        The search runs on at most `search_rows` training rows; the best
+        parameters are then refit on the whole training split.
+        """
+        started = time.perf_counter()
+        best_params = None
+        if param_grid:
+            if len(y) > search_rows:
+                rows = np.random.default_rng(42).choice(len(y), search_rows, replace=False)
+                X_search, y_search = X[rows], np.asarray(y)[rows]
+            else:
+                X_search, y_search = X, np.asarray(y)
+            search = GridSearchCV(
+                model, param_grid, scoring=SEARCH_SCORING[name], cv=self._folds(name, y_search, cv),
+                n_jobs=n_jobs, refit=False
+            )
+            search.fit(X_search, y_search)
+            best_params = search.best_params_
+            model.set_params(**best_params)
+        if 'n_jobs' in model.get_params():
+            model.set_params(n_jobs=n_jobs)
+        model.fit(X, y)
+        return model, best_params, time.perf_counter() - started
+    
+    def train_models(self, dataset_path=None, search=False, param_grids=None, cv=3, n_jobs=None, search_rows=100000,
+                     data=None):
+        """Train prediction models from scratch
+        
+        Both models are fitted at the same time on a two-thread pool (tree
+        building releases the GIL). With `search`, each model first runs a
+        grid search over PARAM_GRIDS[backend] (or `param_grids`) on a process
+        pool of `n_jobs` workers. `data` trains on an in-memory DataFrame.
+        """
+        # Load the training dataset (Parquet/Feather/CSV), else every feature
+        # store batch, else generate a synthetic one
+        self.feature_batch = None
+        if data is not None:
+            df = data
+        elif dataset_path:
+            df = load_training_dataset(dataset_path)
+        else:
+            df, self.feature_batch = self.feature_store.read(columns=TRAINING_COLUMNS)
+            if df is None:
+                df = self.generate_synthetic_dataset()
         X = self.prepare_features(df)
         
         # Train performance prediction model
         y_performance = df['performance_score']
         X_train, X_test, y_train, y_test = train_test_split(X, y_performance, test_size=0.2, random_state=42)
         
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
-        
-        self.performance_model.fit(X_train_scaled, y_train)
-        performance_pred = self.performance_model.predict(X_test_scaled)
-        performance_mse = mean_squared_error(y_test, performance_pred)
+        X_train_scaled = self.performance_scaler.fit_transform(X_train)
+        X_test_scaled = self.performance_scaler.transform(X_test)
         
         # Train dropout prediction model
         y_dropout = df['dropout_risk']
@@ -118,22 +408,172 @@ class LearningAnalyticsPredictor:
             X, y_dropout, test_size=0.2, random_state=42
         )
         
-        X_train_drop_scaled = self.scaler.fit_transform(X_train_drop)
-        X_test_drop_scaled = self.scaler.transform(X_test_drop)
+        X_train_drop_scaled = self.dropout_scaler.fit_transform(X_train_drop)
+        X_test_drop_scaled = self.dropout_scaler.transform(X_test_drop)
         
-        self.dropout_model.fit(X_train_drop_scaled, y_train_drop)
-        dropout_pred = self.dropout_model.predict(X_test_drop_scaled)
-        dropout_accuracy = accuracy_score(y_test_drop, dropout_pred)
-        
-        return {
+        param_grids = (param_grids or PARAM_GRIDS[self.backend]) if search else {}
+        jobs = {
+            'performance': (self.performance_model, X_train_scaled, y_train),
+            'dropout': (self.dropout_model, X_train_drop_scaled, y_train_drop)
+        }
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            futures = {
+                name: pool.submit(self._fit_model, name, model, X_fit, y_fit, param_grids.get(name), cv, n_jobs, search_rows)
+                for name, (model, X_fit, y_fit) in jobs.items()
+            }
+            fitted = {name: future.result() for name, future in futures.items()}
+        self.performance_model, self.dropout_model = fitted['performance'][0], fitted['dropout'][0]
+        self._models_changed()
+        
+        performance_mse = mean_squared_error(y_test, self.performance_model.predict(X_test_scaled))
+        dropout_accuracy = accuracy_score(y_test_drop, self.dropout_model.predict(X_test_drop_scaled))
+        
+        results = {
+            'backend': self.backend,
+            'rows': len(df),
             'performance_mse': performance_mse,
             'dropout_accuracy': dropout_accuracy,
-            'feature_importance_performance': dict(zip(X.columns, self.performance_model.feature_importances_)),
-            'feature_importance_dropout': dict(zip(X.columns, self.dropout_model.feature_importances_))
+            'feature_importance_performance': feature_importances(self.performance_model, X.columns),
+            'feature_importance_dropout': feature_importances(self.dropout_model, X.columns),
+            'training_seconds': {
+                'performance': round(fitted['performance'][2], 3),
+                'dropout': round(fitted['dropout'][2], 3),
+                'total': round(time.perf_counter() - started, 3)
+            }
+        }
+        if search:
+            results['best_params'] = {name: result[1] for name, result in fitted.items()}
+        return results
+    
+    def supports_updates(self):
+        """Whether the loaded models can learn incrementally (only the 'online' backend)"""
+        return hasattr(self.performance_model, 'partial_fit')
+    
+    def update_models(self, df):
+        """Incrementally update online models with new labelled rows
+        
+        Each batch is scored before the models learn from it, so the returned
+        metrics are out-of-sample. Scalers and encoders stay as first fitted,
+        keeping the learned coefficients on a stable feature scale.
+        """
+        if not self.supports_updates():
+            raise ValueError(f"Backend '{self.backend}' cannot be updated incrementally; train with --backend online")
+        
+        X = self.prepare_features(df.copy())
+        X_performance = self.performance_scaler.transform(X)
+        X_dropout = self.dropout_scaler.transform(X)
+        y_performance = df['performance_score']
+        y_dropout = df['dropout_risk']
+        
+        results = {
+            'backend': self.backend,
+            'rows': len(df),
+            'performance_mse': mean_squared_error(y_performance, self.performance_model.predict(X_performance)),
+            'dropout_accuracy': accuracy_score(y_dropout, self.dropout_model.predict(X_dropout))
         }
+        
+        self.performance_model.partial_fit(X_performance, y_performance)
+        self.dropout_model.partial_fit(X_dropout, y_dropout, classes=DROPOUT_CLASSES)
+        self._models_changed()
+        return results
+    
+    def update_from_feature_store(self):
+        """Learn from the feature store batches appended since the last update"""
+        df, batch = self.feature_store.read(after=self.feature_batch, columns=TRAINING_COLUMNS)
+        if df is None:
+            return None
+        results = self.update_models(df)
+        results['feature_batch'] = self.feature_batch = batch
+        return results
+    
+    def save_models(self, training_results=None):
+        """Persist fitted models, scalers and encoders as a new artifact version"""
+        objects = {
+            'performance_model': self.performance_model,
+            'dropout_model': self.dropout_model,
+            'performance_scaler': self.performance_scaler,
+            'dropout_scaler': self.dropout_scaler,
+            'label_encoders': self.label_encoders
+        }
+        self.model_version = self.artifact_store.save(objects, {
+            'backend': self.backend,
+            'feature_batch': self.feature_batch,
+            'training_results': training_results or {}
+        })
+        self.training_results = training_results
+        return self.model_version
+    
+    def load_models(self, version=None, mmap_mode='r'):
+        """Load fitted models from the artifact store instead of retraining
+        
+        Pass mmap_mode=None before update_models: memory-mapped coefficient
+        arrays are read-only.
+        """
+        objects, record = self.artifact_store.load(version, mmap_mode=mmap_mode)
+        self.performance_model = objects['performance_model']
+        self.dropout_model = objects['dropout_model']
+        # Versions saved before per-model scalers share a single one
+        self.performance_scaler = objects.get('performance_scaler', objects.get('scaler'))
+        self.dropout_scaler = objects.get('dropout_scaler', objects.get('scaler'))
+        self.label_encoders = objects['label_encoders']
+        self.backend = record['metadata'].get('backend', 'ensemble')
+        self.feature_batch = record['metadata'].get('feature_batch')
+        self.model_version = record['version']
+        self.training_results = record['metadata'].get('training_results')
+        self._models_changed()
+        return self.model_version
+    
+    def _models_changed(self):
+        self.compile_models()
+        # Cached predictions came from the previous models
+        if self.prediction_cache is not None:
+            self.prediction_cache.clear()
+    
+    def compile_models(self):
+        """Flatten the fitted tree models; models that cannot be compiled stay on sklearn"""
+        self.compiled_models = {}
+        for name, model in (('performance', self.performance_model), ('dropout', self.dropout_model)):
+            try:
+                self.compiled_models[name] = compile_model(model)
+            except TypeError:
+                pass
+        return sorted(self.compiled_models)
+    
+    def _predict_outcomes(self, X):
+        """Predicted performance and dropout probability for each feature row"""
+        compiled = self.compiled_models if len(X) <= COMPILED_MAX_ROWS else {}
+        
+        if 'performance' in compiled:
+            performance_pred = compiled['performance'].predict(standardize(self.performance_scaler, X))
+        else:
+            performance_pred = self.performance_model.predict(self.performance_scaler.transform(X))
+        if 'dropout' in compiled:
+            dropout_prob = compiled['dropout'].predict(standardize(self.dropout_scaler, X))
+        else:
+            dropout_prob = self.dropout_model.predict_proba(self.dropout_scaler.transform(X))[:, 1]
+        return performance_pred, dropout_prob
+    
+    def prediction_key(self, student_data):
+        """Cache key from the model version and the student's normalised feature values"""
+        features = [
+            float(value) if isinstance(value, (int, float, np.number)) else value
+            for value in (student_data.get(column) for column in STUDENT_FEATURES)
+        ]
+        return stable_hash([self.model_version, features])
     
     def predict_student_outcomes(self, student_data):
-        """Predict outcomes for a specific student"""
+        """Predict outcomes for a specific student, memoised when a prediction cache is set"""
+        if self.prediction_cache is None:
+            return self._predict_student_outcomes(student_data)
+        key = self.prediction_key(student_data)
+        result = self.prediction_cache.get(key)
+        if result is None:
+            result = self._predict_student_outcomes(student_data)
+            self.prediction_cache.put(key, result)
+        return result
+    
+    def _predict_student_outcomes(self, student_data):
         # Convert student data to DataFrame
         df = pd.DataFrame([student_data])
         
@@ -147,11 +587,10 @@ class LearningAnalyticsPredictor:
         
         # Prepare features
         X = self.prepare_features(df)
-        X_scaled = self.scaler.transform(X)
         
         # Make predictions
-        performance_pred = self.performance_model.predict(X_scaled)[0]
-        dropout_prob = self.dropout_model.predict_proba(X_scaled)[0][1]  # Probability of dropout
+        performance_pred, dropout_prob = self._predict_outcomes(X)
+        performance_pred, dropout_prob = performance_pred[0], dropout_prob[0]  # Probability of dropout
         
         # Generate insights
         insights = self.generate_insights(student_data, performance_pred, dropout_prob)
@@ -164,69 +603,81 @@ class LearningAnalyticsPredictor:
             'recommendations': self.generate_recommendations(student_data, performance_pred, dropout_prob)
         }
     
+    def _rule_signals(self, student_data, performance_pred, dropout_prob):
+        signals = {'performance': performance_pred, 'dropout': dropout_prob}
+        for rules in (INSIGHT_RULES, RECOMMENDATION_RULES):
+            for signal, _, _, _ in rules:
+                if signal not in signals:
+                    signals[signal] = student_data.get(signal, 0)
+        return signals
+    
     def generate_insights(self, student_data, performance_pred, dropout_prob):
         """Generate insights based on predictions"""
-        insights = []
-        
-        if performance_pred < 60:
-            insights.append("Performance is below average. Consider increasing study time or seeking help.")
-        elif performance_pred > 80:
-            insights.append("Excellent performance predicted! Keep up the great work.")
-        
-        if dropout_prob > 0.5:
-            insights.append("High risk of dropout detected. Immediate intervention recommended.")
-        
-        if student_data.get('study_hours_per_week', 0) < 10:
-            insights.append("Low study hours may impact performance. Consider increasing study time.")
-        
-        if student_data.get('assignment_submission_rate', 0) < 0.7:
-            insights.append("Low assignment submission rate is concerning. Focus on completing assignments.")
-        
-        if student_data.get('login_frequency', 0) < 3:
-            insights.append("Infrequent platform usage. Regular engagement improves outcomes.")
-        
-        return insights
+        signals = self._rule_signals(student_data, performance_pred, dropout_prob)
+        masks = evaluate_rules(INSIGHT_RULES, signals)
+        return [rule[3] for rule, hit in zip(INSIGHT_RULES, masks) if hit]
     
     def generate_recommendations(self, student_data, performance_pred, dropout_prob):
         """Generate personalized recommendations"""
-        recommendations = []
-        
-        if dropout_prob > 0.5:
-            recommendations.append({
-                'priority': 'High',
-                'action': 'Schedule mentoring session',
-                'description': 'Connect with academic advisor for personalized support'
-            })
-        
-        if student_data.get('study_hours_per_week', 0) < 15:
-            recommendations.append({
-                'priority': 'Medium',
-                'action': 'Increase study time',
-                'description': 'Aim for 15-20 hours per week for optimal results'
-            })
-        
-        if student_data.get('forum_participation', 0) < 2:
-            recommendations.append({
-                'priority': 'Low',
-                'action': 'Engage with community',
-                'description': 'Participate in forums to enhance learning through peer interaction'
-            })
-        
-        if student_data.get('video_completion_rate', 0) < 0.8:
-            recommendations.append({
-                'priority': 'Medium',
-                'action': 'Complete video lessons',
-                'description': 'Finish watching all video content for better understanding'
-            })
-        
-        if performance_pred > 85:
-            recommendations.append({
-                'priority': 'Low',
-                'action': 'Consider advanced courses',
-                'description': 'You\'re excelling! Try more challenging content to continue growing'
-            })
-        
-        return recommendations
+        signals = self._rule_signals(student_data, performance_pred, dropout_prob)
+        masks = evaluate_rules(RECOMMENDATION_RULES, signals)
+        return [dict(rule[3]) for rule, hit in zip(RECOMMENDATION_RULES, masks) if hit]
+    
+    def _predict_frame(self, df):
+        """Score one chunk of students with a single predict call per model"""
+        df = df.reset_index(drop=True)
+        X = self.prepare_features(df.copy())
+        
+        performance_pred, dropout_prob = self._predict_outcomes(X)
+        
+        signals = {'performance': performance_pred, 'dropout': dropout_prob}
+        for rules in (INSIGHT_RULES, RECOMMENDATION_RULES):
+            for signal, _, _, _ in rules:
+                if signal not in signals:
+                    column = df[signal] if signal in df.columns else pd.Series(0, index=df.index)
+                    signals[signal] = column.fillna(0).to_numpy()
+        
+        insight_hits = np.column_stack(evaluate_rules(INSIGHT_RULES, signals))
+        recommendation_hits = np.column_stack(evaluate_rules(RECOMMENDATION_RULES, signals))
+        risk_levels = np.select([dropout_prob > 0.7, dropout_prob > 0.3], ['High', 'Medium'], 'Low')
+        performance_rounded = np.round(performance_pred, 2)
+        dropout_rounded = np.round(dropout_prob, 3)
+        student_ids = df['student_id'].tolist() if 'student_id' in df.columns else [None] * len(df)
+        
+        results = []
+        for i in range(len(df)):
+            result = {
+                'predicted_performance': float(performance_rounded[i]),
+                'dropout_probability': float(dropout_rounded[i]),
+                'risk_level': str(risk_levels[i]),
+                'insights': [INSIGHT_RULES[j][3] for j in np.flatnonzero(insight_hits[i])],
+                'recommendations': [dict(RECOMMENDATION_RULES[j][3]) for j in np.flatnonzero(recommendation_hits[i])]
+            }
+            if student_ids[i] is not None:
+                result['student_id'] = student_ids[i]
+            results.append(result)
+        
+        return results
+    
+    def predict_many(self, students, chunk_size=10000):
+        """Predict outcomes for many students, yielding result lists chunk by chunk
+        
+        `students` may be a DataFrame or any iterable of student dicts; the
+        iterable is consumed lazily so very large cohorts stream through.
+        """
+        if isinstance(students, pd.DataFrame):
+            for start in range(0, len(students), chunk_size):
+                yield self._predict_frame(students.iloc[start:start + chunk_size])
+            return
+        
+        batch = []
+        for student in students:
+            batch.append(student)
+            if len(batch) == chunk_size:
+                yield self._predict_frame(pd.DataFrame(batch))
+                batch = []
+        if batch:
+            yield self._predict_frame(pd.DataFrame(batch))
     
     def analyze_learning_patterns(self, student_history):
         """Analyze learning patterns over time"""
@@ -247,23 +698,89 @@ def main():
         print(json.dumps({"error": "Please provide student data"}))
         return
     
+    if sys.argv[1] in ('train', 'update'):
+        parser = argparse.ArgumentParser(prog='analytics_predictor.py')
+        parser.add_argument('mode', choices=['train', 'update'])
+        parser.add_argument('dataset_path', nargs='?', help='dataset file (update: appended to the feature store first)')
+        parser.add_argument('--backend', choices=sorted(MODEL_BACKENDS), default=DEFAULT_BACKEND)
+        parser.add_argument('--search', action='store_true', help='cross-validated grid search before fitting')
+        parser.add_argument('--cv', type=int, default=3)
+        parser.add_argument('--n-jobs', type=int, default=None, help='worker processes per model search (-1 = all cores)')
+        parser.add_argument('--search-rows', type=int, default=100000, help='training rows sampled for the search')
+        args = parser.parse_args()
+        
+        if args.mode == 'train':
+            # Offline retraining: fit once and publish a new artifact version
+            predictor = LearningAnalyticsPredictor(backend=args.backend)
+            try:
+                training_results = predictor.train_models(
+                    args.dataset_path, search=args.search, cv=args.cv, n_jobs=args.n_jobs, search_rows=args.search_rows
+                )
+            except ValueError as e:
+                print(json.dumps({"error": str(e)}))
+                return
+        else:
+            # Nightly update: learn only from batches appended since the latest version
+            predictor = LearningAnalyticsPredictor()
+            try:
+                predictor.load_models(mmap_mode=None)
+            except FileNotFoundError:
+                print(json.dumps({"error": "No trained models found. Run: python ml_models/analytics_predictor.py train --backend online"}))
+                return
+            # Checked before appending, so a rejected batch is not left for a later update
+            if not predictor.supports_updates():
+                print(json.dumps({
+                    "error": f"Model version {predictor.model_version} ({predictor.backend} backend) cannot be updated "
+                             "incrementally. Retrain it with: python ml_models/analytics_predictor.py train --backend online"
+                }))
+                return
+            try:
+                if args.dataset_path:
+                    predictor.feature_store.append(load_training_dataset(args.dataset_path)[TRAINING_COLUMNS])
+                training_results = predictor.update_from_feature_store()
+            except ValueError as e:
+                print(json.dumps({"error": str(e)}))
+                return
+            if training_results is None:
+                print(json.dumps({'model_version': predictor.model_version, 'updated': False}))
+                return
+            training_results['base_version'] = predictor.model_version
+        
+        version = predictor.save_models(training_results)
+        print(json.dumps({'model_version': version, 'model_performance': training_results}, indent=2, default=float))
+        return
+    
+    if sys.argv[1] == 'predict-batch':
+        # Batch scoring: one student JSON object per stdin line, one result per stdout line
+        predictor = LearningAnalyticsPredictor()
+        predictor.load_models()
+        students = (json.loads(line) for line in sys.stdin if line.strip())
+        for chunk in predictor.predict_many(students):
+            sys.stdout.write(''.join(json.dumps(result, default=float) + '\n' for result in chunk))
+            sys.stdout.flush()
+        return
+    
     try:
         student_data = json.loads(sys.argv[1])
         
         predictor = LearningAnalyticsPredictor()
         
-        # Train models (in production, this would be done offline)
-        training_results = predictor.train_models()
+        try:
+            predictor.load_models()
+        except FileNotFoundError:
+            print(json.dumps({"error": "No trained models found. Run: python ml_models/analytics_predictor.py train"}))
+            return
         
         # Make predictions
         predictions = predictor.predict_student_outcomes(student_data)
         
         result = {
             'predictions': predictions,
-            'model_performance': training_results
+            'model_version': predictor.model_version,
+            'model_performance': predictor.training_results
         }
         
-        print(json.dumps(result, indent=2))
+        print(json.dumps(result, indent=2, default=float))
         
     except Exception as e:
         print(json.dumps({"error": str(e)}))
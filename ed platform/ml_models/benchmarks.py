@@ -0,0 +1,344 @@
+import os
+import sys
+import json
+import time
+import pickle
+import argparse
+import tempfile
+import subprocess
+
+import numpy as np
+
+ML_MODELS_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASETS_DIR = os.path.join(os.path.dirname(ML_MODELS_DIR), 'datasets')
+
+
+def _timed(func, *args, repeat=3):
+    """Best wall-clock time of `repeat` runs, with the last result"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+# Suffixes appended to corpus keywords; each keeps the keyword a substring, so
+# the legacy scan still finds it ('functions', 'working', 'helpful')
+INFLECTIONS = ['', '', 's', 'ing', 'ful']
+
+# Minimum share of corpus messages on which the compiled matcher and the legacy
+# scan must agree
+MIN_INTENT_AGREEMENT = 0.99
+
+
+def inflect(keyword, suffix):
+    """Append suffix to the keyword's last word, where it reads as an inflection"""
+    *head, last = keyword.split()
+    if len(last) < 3 or last.endswith(('s', 'e', 'ing')):
+        return keyword
+    return ' '.join(head + [last + suffix])
+
+
+def build_message_corpus(n_messages, seed=42):
+    """Synthetic chat messages mixing intent keywords, topics and filler words"""
+    from chatbot import INTENT_KEYWORDS
+    from content_index import ContentIndex
+
+    rng = np.random.default_rng(seed)
+    keywords = [word for words in INTENT_KEYWORDS.values() for word in words] + ContentIndex.load().topics
+    # No filler word contains a keyword, so the legacy substring scan only hits inserted ones
+    filler = (
+        'i am trying to understand the part but it is not clear to me yet could you '
+        'explain again please because my class begins tomorrow and the exam is soon'
+    ).split()
+
+    messages = []
+    for _ in range(n_messages):
+        words = list(rng.choice(filler, rng.integers(4, 30)))
+        for _ in range(rng.integers(0, 3)):
+            keyword = inflect(keywords[rng.integers(len(keywords))], INFLECTIONS[rng.integers(len(INFLECTIONS))])
+            words.insert(rng.integers(0, len(words) + 1), keyword)
+        messages.append(' '.join(words).capitalize() + rng.choice(['?', '!', '.', '']))
+    return messages
+
+
+def legacy_classify_intent(message_clean):
+    """Pre-compilation classifier: per-call keyword dict and substring scan"""
+    from chatbot import INTENT_KEYWORDS
+
+    keywords = {intent: list(words) for intent, words in INTENT_KEYWORDS.items()}
+    for intent, words in keywords.items():
+        if any(word in message_clean for word in words):
+            return intent
+    return 'general'
+
+
+def benchmark_intent(n_messages):
+    """Compare the compiled keyword matcher against the legacy substring scan
+    
+    Raises AssertionError when they agree on fewer than MIN_INTENT_AGREEMENT of
+    the messages.
+    """
+    from chatbot import EducationalChatbot, INTENT_MATCHER
+
+    chatbot = EducationalChatbot()
+    # Both classifiers see the same preprocessed text, so only matching is timed
+    corpus = [chatbot.preprocess_text(m) for m in build_message_corpus(n_messages)]
+
+    legacy_time, legacy = _timed(lambda: [legacy_classify_intent(m) for m in corpus])
+    compiled_time, compiled = _timed(lambda: [INTENT_MATCHER.match(m) or 'general' for m in corpus])
+
+    agreement = float(np.mean([a == b for a, b in zip(legacy, compiled)]))
+    if agreement < MIN_INTENT_AGREEMENT:
+        disagreements = [(m, a, b) for m, a, b in zip(corpus, legacy, compiled) if a != b][:5]
+        raise AssertionError(
+            f"Compiled matcher agrees with the legacy scan on only {agreement:.4f} of messages, e.g. {disagreements}"
+        )
+    return {
+        'messages': n_messages,
+        'legacy_seconds': round(legacy_time, 4),
+        'compiled_seconds': round(compiled_time, 4),
+        'speedup': round(legacy_time / compiled_time, 2),
+        'legacy_us_per_message': round(legacy_time / n_messages * 1e6, 2),
+        'compiled_us_per_message': round(compiled_time / n_messages * 1e6, 2),
+        'agreement': round(agreement, 4)
+    }
+
+
+def _run_measured(script, cwd):
+    """Run a snippet in a fresh interpreter; returns its JSON output plus peak RSS
+
+    ru_maxrss is a lifetime high-water mark, so every measurement needs its own
+    process.
+    """
+    script += (
+        '\nimport resource, sys'
+        '\nscale = 1 if sys.platform == "darwin" else 1024'  # bytes on macOS, KiB on Linux
+        '\nresult["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20, 1)'
+        '\nprint(json.dumps(result))'
+    )
+    output = subprocess.run([sys.executable, '-c', script], cwd=cwd, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def benchmark_generator_memory(n_students):
+    """Peak RSS and frame size of generating students in regular vs compact mode"""
+    template = (
+        'import json, time\n'
+        'from education_data_generator import EducationDatasetGenerator\n'
+        'generator = EducationDatasetGenerator(compact={compact})\n'
+        'start = time.perf_counter()\n'
+        'students = generator.generate_student_dataset({n})\n'
+        'result = {{"seconds": round(time.perf_counter() - start, 3),'
+        ' "frame_mb": round(students.memory_usage(deep=True).sum() / 2 ** 20, 1)}}'
+    )
+    baseline = _run_measured(
+        'import json\nimport education_data_generator\nresult = {}', DATASETS_DIR
+    )['peak_rss_mb']
+
+    result = {'students': n_students, 'import_rss_mb': baseline}
+    for mode, compact in (('regular', False), ('compact', True)):
+        result[mode] = _run_measured(template.format(compact=compact, n=n_students), DATASETS_DIR)
+    result['peak_rss_ratio'] = round(
+        (result['regular']['peak_rss_mb'] - baseline) / (result['compact']['peak_rss_mb'] - baseline), 2
+    )
+    return result
+
+
+def measure_backend(n_rows, backend, predict_rows=10000, single_calls=200):
+    """Fit one predictor backend on a synthetic dataset and time its predict paths"""
+    from analytics_predictor import LearningAnalyticsPredictor
+    from model_store import ModelArtifactStore
+
+    predictor = LearningAnalyticsPredictor(ModelArtifactStore('benchmark', tempfile.mkdtemp()), backend)
+    df = predictor.generate_synthetic_dataset(n_rows)
+    training = predictor.train_models(data=df)
+
+    students = df.drop(columns=['performance_score', 'dropout_risk', 'estimated_completion_weeks'])
+    student = students.iloc[0].to_dict()
+    single = []
+    for _ in range(single_calls):
+        start = time.perf_counter()
+        predictor.predict_student_outcomes(student)
+        single.append(time.perf_counter() - start)
+
+    batch = students.head(predict_rows)
+    batch_time, _ = _timed(lambda: [result for chunk in predictor.predict_many(batch) for result in chunk], repeat=1)
+
+    return {
+        'fit_seconds': training['training_seconds']['total'],
+        'performance_mse': round(float(training['performance_mse']), 3),
+        'dropout_accuracy': round(float(training['dropout_accuracy']), 4),
+        'single_row_p50_ms': round(float(np.percentile(single, 50)) * 1e3, 3),
+        'single_row_p99_ms': round(float(np.percentile(single, 99)) * 1e3, 3),
+        'batch_rows': len(batch),
+        'batch_rows_per_second': round(len(batch) / batch_time),
+        'model_mb': round(len(pickle.dumps((predictor.performance_model, predictor.dropout_model))) / 2 ** 20, 2)
+    }
+
+
+def benchmark_backends(rows, backends):
+    """Compare predictor backends across dataset sizes, one fresh process per run"""
+    results = []
+    for n_rows in rows:
+        for backend in backends:
+            script = (
+                'import json\n'
+                'from benchmarks import measure_backend\n'
+                f'result = measure_backend({n_rows}, {backend!r})'
+            )
+            result = _run_measured(script, ML_MODELS_DIR)
+            results.append({'rows': n_rows, 'backend': backend, **result})
+            print(json.dumps(results[-1]), file=sys.stderr, flush=True)
+    return results
+
+
+def _latency_ms(func, calls=200):
+    """Median latency of repeated calls in milliseconds"""
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return round(float(np.median(samples)) * 1e3, 3)
+
+
+def benchmark_tree_compiler(n_rows, backends=('ensemble', 'hist'), batch_rows=10000):
+    """Compare compiled tree evaluation against sklearn: agreement, latency and throughput"""
+    from analytics_predictor import LearningAnalyticsPredictor
+    from model_store import ModelArtifactStore
+
+    results = []
+    for backend in backends:
+        predictor = LearningAnalyticsPredictor(ModelArtifactStore('benchmark', tempfile.mkdtemp()), backend)
+        df = predictor.generate_synthetic_dataset(n_rows)
+        predictor.train_models(data=df)
+        X = predictor.prepare_features(df.copy())
+        X_performance = predictor.performance_scaler.transform(X)
+        X_dropout = predictor.dropout_scaler.transform(X)
+        compiled = predictor.compiled_models
+
+        paths = {
+            'performance': (
+                lambda rows: predictor.performance_model.predict(X_performance[rows]),
+                lambda rows: compiled['performance'].predict(X_performance[rows])
+            ),
+            'dropout': (
+                lambda rows: predictor.dropout_model.predict_proba(X_dropout[rows])[:, 1],
+                lambda rows: compiled['dropout'].predict(X_dropout[rows])
+            )
+        }
+        single, batch = slice(0, 1), slice(0, batch_rows)
+        result = {'backend': backend, 'rows': n_rows}
+        for name, (sklearn_predict, compiled_predict) in paths.items():
+            sklearn_ms = _latency_ms(lambda: sklearn_predict(single))
+            compiled_ms = _latency_ms(lambda: compiled_predict(single))
+            sklearn_batch, expected = _timed(sklearn_predict, batch, repeat=1)
+            compiled_batch, actual = _timed(compiled_predict, batch, repeat=1)
+            result[name] = {
+                'max_abs_error': float(np.abs(expected - actual).max()),
+                'single_row_sklearn_ms': sklearn_ms,
+                'single_row_compiled_ms': compiled_ms,
+                'single_row_speedup': round(sklearn_ms / compiled_ms, 1),
+                f'batch_{len(expected)}_sklearn_seconds': round(sklearn_batch, 4),
+                f'batch_{len(expected)}_compiled_seconds': round(compiled_batch, 4)
+            }
+
+        # End to end, including feature preparation and rule evaluation
+        student = df.drop(columns=['performance_score', 'dropout_risk', 'estimated_completion_weeks']).iloc[0].to_dict()
+        compiled_ms = _latency_ms(lambda: predictor.predict_student_outcomes(student))
+        predictor.compiled_models = {}
+        sklearn_ms = _latency_ms(lambda: predictor.predict_student_outcomes(student))
+        result['predict_student_outcomes'] = {
+            'sklearn_ms': sklearn_ms,
+            'compiled_ms': compiled_ms,
+            'speedup': round(sklearn_ms / compiled_ms, 1)
+        }
+        results.append(result)
+    return results
+
+
+def build_passages(n_passages, vocabulary_size=50000, seed=42):
+    """Synthetic knowledge-base passages with Zipf-distributed words over the real topics"""
+    from content_index import ContentIndex
+
+    rng = np.random.default_rng(seed)
+    topics = ContentIndex.load().topics
+    vocabulary = np.array([f'word{i}' for i in range(vocabulary_size)])
+    weights = 1.0 / np.arange(1, vocabulary_size + 1)
+    weights /= weights.sum()
+    lengths = rng.integers(20, 60, n_passages)
+    words = np.split(rng.choice(vocabulary, lengths.sum(), p=weights), np.cumsum(lengths)[:-1])
+    passages = [
+        {'id': str(i), 'topic': topics[i % len(topics)], 'kind': 'concept', 'text': ' '.join(passage_words)}
+        for i, passage_words in enumerate(words)
+    ]
+    return passages, vocabulary, weights
+
+
+def benchmark_content_index(n_passages, n_queries=200, k=3):
+    """Build time and query latency of the content index against a full cosine scan"""
+    from sklearn.metrics.pairwise import cosine_similarity
+    from content_index import ContentIndex
+
+    passages, vocabulary, weights = build_passages(n_passages)
+    build_seconds, index = _timed(ContentIndex, passages, repeat=1)
+    rng = np.random.default_rng(7)
+    queries = [' '.join(rng.choice(vocabulary, rng.integers(3, 8), p=weights)) for _ in range(n_queries)]
+
+    def full_scan(query):
+        scores = cosine_similarity(index.vectorizer.transform([query]), index.matrix).ravel()
+        return np.argsort(-scores, kind='stable')[:k]
+
+    def indexed(query):
+        return [int(passage['id']) for _, passage in index.search(query, k)]
+
+    indexed_seconds, found = _timed(lambda: [indexed(query) for query in queries], repeat=1)
+    scan_seconds, expected = _timed(lambda: [full_scan(query) for query in queries], repeat=1)
+    return {
+        'passages': n_passages,
+        'vocabulary': len(index.vectorizer.vocabulary_),
+        'build_seconds': round(build_seconds, 2),
+        'query_indexed_ms': round(indexed_seconds / n_queries * 1e3, 3),
+        'query_full_scan_ms': round(scan_seconds / n_queries * 1e3, 3),
+        'top_k_agreement': float(np.mean([set(a) == set(b.tolist()) for a, b in zip(found, expected)]))
+    }
+
+
+BENCHMARKS = {
+    'intent': benchmark_intent,
+    'generator-memory': benchmark_generator_memory,
+    'backends': benchmark_backends,
+    'tree-compiler': benchmark_tree_compiler,
+    'content-index': benchmark_content_index
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Performance benchmarks for the EduAI ML models')
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+    parser.add_argument('--messages', type=int, default=100000)
+    parser.add_argument('--students', type=int, default=1000000)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--backends', nargs='+', default=['ensemble', 'hist', 'online'])
+    parser.add_argument('--passages', type=int, default=100000)
+    args = parser.parse_args()
+
+    if args.benchmark == 'intent':
+        result = benchmark_intent(args.messages)
+    elif args.benchmark == 'generator-memory':
+        result = benchmark_generator_memory(args.students)
+    elif args.benchmark == 'backends':
+        result = benchmark_backends(args.rows, args.backends)
+    elif args.benchmark == 'tree-compiler':
+        result = benchmark_tree_compiler(args.rows[0], [b for b in args.backends if b != 'online'])
+    elif args.benchmark == 'content-index':
+        result = benchmark_content_index(args.passages)
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import sys
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def stable_hash(value):
+    """Hex digest of a JSON-serialisable value, identical across processes and runs"""
+    payload = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def deep_sizeof(value):
+    """Approximate memory footprint of nested dicts, lists, tuples and scalars in bytes"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_sizeof(key) + deep_sizeof(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(deep_sizeof(item) for item in value)
+    return size
+
+
+class LRUCache:
+    """Thread-safe LRU cache with per-entry TTL, an entry cap and a memory cap
+
+    Expired entries are dropped when they are read; the least recently used
+    entries are evicted whenever either cap is exceeded. Cached values are
+    shared with callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries=10000, ttl_seconds=300, max_bytes=64 * 2 ** 20, size_of=deep_sizeof):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.lock = threading.Lock()
+        # key -> (value, expires_at, size)
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _remove(self, key):
+        _, _, size = self.entries.pop(key)
+        self.bytes -= size
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[1] < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = self.size_of(value)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (value, time.monotonic() + self.ttl_seconds, size)
+            self.bytes += size
+            while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry; hit/miss counters are kept"""
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'bytes': self.bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
@@ -3,21 +3,129 @@ import json
 import numpy as np
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import StratifiedKFold, cross_val_predict
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.pipeline import Pipeline
-import pickle
 import os
 import re
-from datetime import datetime
+
+from caching import stable_hash
+from model_store import ModelArtifactStore
+from context_store import ConversationContextStore
+from content_index import ContentIndex
+from intent_text import normalize_word, intent_tokens
+
+DEFAULT_UTTERANCES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'intent_utterances.csv')
+
+# The ML tier never routes below this probability, whatever its held-out precision
+MIN_INTENT_CONFIDENCE = 0.35
+# A model is only trained, saved or enabled with at least this cross-validated accuracy
+MIN_INTENT_ACCURACY = 0.65
+# The routing threshold is the lowest confidence whose held-out predictions reach this precision
+TARGET_INTENT_PRECISION = 0.9
+INTENT_CV_FOLDS = 5
+
+# Keyword tables; dict order is the match priority when several labels hit
+INTENT_KEYWORDS = {
+    'greeting': ['hello', 'hi', 'hey', 'good morning', 'good afternoon', 'start'],
+    'programming': ['code', 'programming', 'python', 'javascript', 'html', 'css', 'algorithm', 'function'],
+    'mathematics': ['math', 'mathematics', 'algebra', 'calculus', 'geometry', 'statistics', 'equation'],
+    'science': ['science', 'physics', 'chemistry', 'biology', 'experiment', 'theory'],
+    'study_tips': ['study', 'learn', 'tips', 'technique', 'method', 'how to study', 'memory'],
+    'motivation': ['motivation', 'encourage', 'difficult', 'hard', 'give up', 'frustrated'],
+    'career': ['career', 'job', 'future', 'profession', 'work', 'employment'],
+    'help': ['help', 'assist', 'support', 'what can you do', 'capabilities']
+}
+
+# Knowledge-base passages per topic answer, shown in this kind order
+CONTENT_PASSAGES = 3
+CONTENT_KIND_ORDER = {'definition': 0, 'concept': 1, 'example': 2, 'tips': 3}
+
+FALLBACK_RESPONSE = "I'm having trouble processing that. Could you rephrase your question?"
+
+# Intents a vague follow-up ('general') keeps discussing
+SUBJECT_INTENTS = ('programming', 'mathematics', 'science')
+
+def precision_threshold(confidence, correct, target, floor=0.0):
+    """Lowest confidence at which the predictions scoring at least that reach `target` precision
+    
+    Returns None when no threshold does.
+    """
+    order = np.argsort(-confidence, kind='stable')
+    precision = np.cumsum(correct[order]) / np.arange(1, len(order) + 1)
+    reached = np.flatnonzero(precision >= target)
+    if reached.size == 0:
+        return None
+    return max(float(confidence[order[reached[-1]]]), floor)
+
+class KeywordMatcher:
+    """Keyword table compiled once into hashed word / phrase lookups
+    
+    Matching is a single pass over the whitespace tokens of preprocessed text,
+    so keywords only hit on whole words ('hi' does not match 'this'). Keywords
+    and tokens are both passed through normalize_word, so inflected forms hit
+    too ('functions', 'jobs', 'helpful').
+    """
+    
+    def __init__(self, table):
+        self.labels = list(table)
+        # first word -> [(remaining words, priority)], single words have no remainder
+        self.index = {}
+        for priority, keywords in enumerate(table.values()):
+            for keyword in keywords:
+                first, *rest = map(normalize_word, keyword.split())
+                self.index.setdefault(first, []).append((tuple(rest), priority))
+    
+    def match(self, text):
+        """Return the highest-priority label present in text, or None"""
+        tokens = [normalize_word(token) for token in text.split()]
+        hits = self.index.keys() & tokens
+        if not hits:
+            return None
+        
+        best = len(self.labels)
+        for word in hits:
+            for rest, priority in self.index[word]:
+                if priority >= best:
+                    continue
+                if not rest:
+                    best = priority
+                    continue
+                # Multi-word phrases are only checked where their first word occurs
+                size = len(rest) + 1
+                for position, token in enumerate(tokens):
+                    if token == word and tuple(tokens[position + 1:position + size]) == rest:
+                        best = priority
+                        break
+        
+        return self.labels[best] if best < len(self.labels) else None
+
+INTENT_MATCHER = KeywordMatcher(INTENT_KEYWORDS)
 
 class EducationalChatbot:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(max_features=5000, stop_words='english')
-        self.classifier = MultinomialNB()
+    def __init__(self, artifact_store=None, context_store=None, content_index=None, response_cache=None):
+        # No stop-word list: 'what can you do' and 'how are you' are all stop words
+        self.vectorizer = TfidfVectorizer(max_features=5000, sublinear_tf=True, tokenizer=intent_tokens, token_pattern=None)
+        self.classifier = MultinomialNB(alpha=0.1)
         self.responses_db = self.load_responses_database()
-        self.context_memory = {}
+        self.context_store = context_store or ConversationContextStore()
+        self.content_index = content_index or ContentIndex.load()
+        # Topics come from the knowledge base and match on whole words
+        self.topic_matcher = KeywordMatcher({topic: [topic] for topic in self.content_index.topics})
+        self.artifact_store = artifact_store or ModelArtifactStore('chatbot_intent')
+        # Optional caching.LRUCache of finished replies, see response_key
+        self.response_cache = response_cache
+        self.intent_model = None
+        self.intent_threshold = None
+        self.model_version = None
+        try:
+            self.load_intent_model()
+        except FileNotFoundError:
+            # Keyword matching alone until `chatbot.py --train` has been run
+            pass
+        except Exception as e:
+            # An unreadable or incompatible artifact must not take the chatbot down
+            print(f"Intent model not loaded, using keyword matching: {e}", file=sys.stderr)
         
     def load_responses_database(self):
         """Load educational responses database"""
@@ -70,101 +178,327 @@ class EducationalChatbot:
         text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
         return text.strip()
     
-    def classify_intent(self, message):
-        """Classify user intent using keyword matching and ML"""
-        message_clean = self.preprocess_text(message)
-        
-        # Keyword-based classification
-        keywords = {
-            'greeting': ['hello', 'hi', 'hey', 'good morning', 'good afternoon', 'start'],
-            'programming': ['code', 'programming', 'python', 'javascript', 'html', 'css', 'algorithm', 'function'],
-            'mathematics': ['math', 'mathematics', 'algebra', 'calculus', 'geometry', 'statistics', 'equation'],
-            'science': ['science', 'physics', 'chemistry', 'biology', 'experiment', 'theory'],
-            'study_tips': ['study', 'learn', 'tips', 'technique', 'method', 'how to study', 'memory'],
-            'motivation': ['motivation', 'encourage', 'difficult', 'hard', 'give up', 'frustrated'],
-            'career': ['career', 'job', 'future', 'profession', 'work', 'employment'],
-            'help': ['help', 'assist', 'support', 'what can you do', 'capabilities']
+    def train_intent_model(self, utterances_path=DEFAULT_UTTERANCES):
+        """Fit the TF-IDF + MultinomialNB intent pipeline on a labelled utterance file
+        
+        Accuracy and the routing threshold come from out-of-fold predictions
+        of a stratified cross-validation. Utterances labelled 'general' teach
+        the model what to leave to the generic reply. Raises ValueError, and
+        keeps the current model, when the new one is not accurate enough to
+        route messages.
+        """
+        df = pd.read_csv(utterances_path)
+        texts = df['text'].map(self.preprocess_text)
+        labels = df['intent'].to_numpy()
+        
+        pipeline = Pipeline([('tfidf', self.vectorizer), ('classifier', self.classifier)])
+        folds = StratifiedKFold(INTENT_CV_FOLDS, shuffle=True, random_state=42)
+        proba = cross_val_predict(pipeline, texts, labels, cv=folds, method='predict_proba')
+        predicted = np.unique(labels)[proba.argmax(axis=1)]
+        confidence = proba.max(axis=1)
+        
+        # Only messages routed to a specific intent can be misrouted
+        routed = predicted != 'general'
+        correct = predicted[routed] == labels[routed]
+        threshold = precision_threshold(confidence[routed], correct, TARGET_INTENT_PRECISION, MIN_INTENT_CONFIDENCE)
+        results = {
+            'utterances': len(df),
+            'intents': sorted(set(labels)),
+            'cv_folds': INTENT_CV_FOLDS,
+            'cv_accuracy': round(float(np.mean(predicted == labels)), 4),
+            'confidence_threshold': threshold
         }
+        if threshold is not None:
+            above = confidence[routed] >= threshold
+            results['cv_precision'] = round(float(correct[above].mean()), 4)
+            results['cv_routed_share'] = round(float(above.sum() / len(labels)), 4)
+        
+        if results['cv_accuracy'] < MIN_INTENT_ACCURACY or threshold is None:
+            raise ValueError(
+                f"Intent model reaches {results['cv_accuracy']:.3f} cross-validated accuracy "
+                f"(minimum {MIN_INTENT_ACCURACY}) on {len(df)} utterances; add more labelled phrasings"
+            )
+        
+        # Final model uses every labelled utterance
+        self.intent_model = pipeline.fit(texts, labels)
+        self.intent_threshold = threshold
+        return results
+    
+    def save_intent_model(self, training_results=None):
+        """Pickle the fitted intent pipeline into the artifact store"""
+        if self.intent_model is None:
+            raise ValueError("No intent model has been trained")
+        self.model_version = self.artifact_store.save({'intent_model': self.intent_model}, training_results)
+        return self.model_version
+    
+    def load_intent_model(self, version=None):
+        """Load the fitted intent pipeline once from the artifact store
+        
+        Artifacts below MIN_INTENT_ACCURACY, or saved without a cross-validated
+        threshold, are not enabled: keyword matching alone answers and None is
+        returned.
+        """
+        objects, record = self.artifact_store.load(version, mmap_mode=None)
+        metadata = record['metadata']
+        if metadata.get('confidence_threshold') is None or metadata.get('cv_accuracy', 0) < MIN_INTENT_ACCURACY:
+            return None
+        self.intent_model = objects['intent_model']
+        self.intent_threshold = metadata['confidence_threshold']
+        self.model_version = record['version']
+        return self.model_version
+    
+    def _classify_clean(self, cleaned):
+        # Tier 1: keyword matching; tier 2: one predict_proba call for everything left
+        intents = [INTENT_MATCHER.match(text) for text in cleaned]
+        pending = [i for i, intent in enumerate(intents) if intent is None and cleaned[i]]
         
-        for intent, words in keywords.items():
-            if any(word in message_clean for word in words):
-                return intent
+        if pending and self.intent_model is not None:
+            proba = self.intent_model.predict_proba([cleaned[i] for i in pending])
+            best = proba.argmax(axis=1)
+            confidence = proba[np.arange(len(pending)), best]
+            for i, label, score in zip(pending, best, confidence):
+                if score >= self.intent_threshold:
+                    intents[i] = str(self.intent_model.classes_[label])
         
-        return 'general'
+        return [intent or 'general' for intent in intents]
+    
+    def classify_intents(self, messages):
+        """Classify a batch of messages with a single model call"""
+        return self._classify_clean([self.preprocess_text(message) for message in messages])
+    
+    def classify_intent(self, message):
+        """Classify user intent using keyword matching and ML"""
+        return self.classify_intents([message])[0]
     
-    def get_contextual_response(self, message, context, intent):
-        """Generate contextual response based on intent and context"""
+    def resolve_intent(self, intent, history):
+        """Let a vague follow-up continue the subject of the previous turn"""
+        if intent == 'general' and history and history[-1][0] in SUBJECT_INTENTS:
+            return history[-1][0]
+        return intent
+    
+    def get_contextual_response(self, message, context, intent, history=()):
+        """Generate contextual response based on intent, context and recent turns"""
+        return ''.join(self._contextual_chunks(message, context, intent, history))
+    
+    def _contextual_chunks(self, message, context, intent, history):
         if intent in self.responses_db:
             base_responses = self.responses_db[intent]
-            response = np.random.choice(base_responses)
+            # The variant is a function of the message, so repeats (and cached replies) agree
+            variant = int(stable_hash([self.preprocess_text(message), context, intent]), 16)
+            response = base_responses[variant % len(base_responses)]
+            if intent in SUBJECT_INTENTS and history and history[-1][0] == intent:
+                response = f"Let's keep going with {intent}. " + response
         else:
             response = "I understand you're asking about that topic. Could you be more specific so I can help better?"
+        yield response
         
         # Add context-specific information
         if context == 'course':
-            response += " Since you're in a course, I can provide more detailed explanations if needed."
+            yield " Since you're in a course, I can provide more detailed explanations if needed."
         elif context == 'quiz':
-            response += " If you're preparing for a quiz, I can help you practice with similar questions."
-        
-        return response
-    
-    def generate_educational_content(self, topic):
-        """Generate educational content for specific topics"""
-        content_db = {
-            'javascript': {
-                'definition': "JavaScript is a programming language that enables interactive web pages.",
-                'example': "Example: let greeting = 'Hello World'; console.log(greeting);",
-                'tips': "Practice with small projects and use console.log() to debug your code."
-            },
-            'python': {
-                'definition': "Python is a versatile programming language known for its simplicity.",
-                'example': "Example: print('Hello World')",
-                'tips': "Start with basic syntax and gradually move to more complex concepts."
-            },
-            'algebra': {
-                'definition': "Algebra uses symbols and letters to represent numbers in equations.",
-                'example': "Example: If x + 5 = 10, then x = 5",
-                'tips': "Practice solving equations step by step and check your answers."
-            }
-        }
+            yield " If you're preparing for a quiz, I can help you practice with similar questions."
+    
+    def generate_educational_content(self, topic, query=None):
+        """Answer from the top knowledge-base passages for a topic and query"""
+        return ''.join(self._content_chunks(topic, query))
+    
+    def _content_chunks(self, topic, query=None):
+        results = self.content_index.search(query or topic, k=CONTENT_PASSAGES, topic=topic)
+        if not results:
+            yield f"I'd be happy to help you learn about {topic}. Could you ask a more specific question?"
+            return
         
-        if topic.lower() in content_db:
-            content = content_db[topic.lower()]
-            return f"{content['definition']} {content['example']} Tip: {content['tips']}"
+        passages = sorted((passage for _, passage in results), key=lambda p: CONTENT_KIND_ORDER.get(p['kind'], 0))
+        for position, passage in enumerate(passages):
+            text = f"Tip: {passage['text']}" if passage['kind'] == 'tips' else passage['text']
+            yield text if position == 0 else ' ' + text
+    
+    def _response_chunks(self, message, message_clean, context, intent, topic, history):
+        # Check if user is asking about specific topic
+        if topic:
+            yield from self._content_chunks(topic, message_clean)
+            return
+        
+        # Generate contextual response
+        yield from self._contextual_chunks(message, context, intent, history)
+        
+        # Add learning suggestions
+        if intent in SUBJECT_INTENTS:
+            yield f"\n\nWould you like me to suggest some practice exercises for {intent}?"
+    
+    def response_key(self, message_clean, context, history):
+        """Cache key of everything a reply depends on
         
-        return f"I'd be happy to help you learn about {topic}. Could you ask a more specific question?"
+        Only the previous turn's intent is read from the session history.
+        Including the model version means replies from an older intent model
+        are never served; they simply age out of the cache.
+        """
+        previous_intent = history[-1][0] if history else None
+        return stable_hash([self.model_version, message_clean, context, previous_intent])
     
-    def process_message(self, message, context='general'):
+    def _reply(self, message, message_clean, context, session_id, intent=None, hit=None, lookup=True):
+        """Yield (intent, topic) for one message, then the parts of its reply
+        
+        The reply comes from `hit`, the response cache (when `lookup`), or is
+        built from the classified `intent` (classified here when None). Once
+        the last part is out the reply is cached and the turn recorded in the
+        session, so callers must exhaust the generator.
+        """
+        history = self.context_store.turns(session_id) if session_id is not None else ()
+        key = self.response_key(message_clean, context, history) if self.response_cache is not None else None
+        if hit is None and lookup and key is not None:
+            hit = self.response_cache.get(key)
+        
+        if hit is not None:
+            response, intent, topic = hit
+            yield intent, topic
+            yield response
+        else:
+            topic = self.topic_matcher.match(message_clean)
+            if intent is None:
+                intent = self._classify_clean([message_clean])[0]
+            intent = self.resolve_intent(intent, history)
+            yield intent, topic
+            parts = []
+            for text in self._response_chunks(message, message_clean, context, intent, topic, history):
+                parts.append(text)
+                yield text
+            if key is not None:
+                self.response_cache.put(key, (''.join(parts), intent, topic))
+        
+        if session_id is not None:
+            self.context_store.append(session_id, intent, topic)
+    
+    def process_batch(self, messages, contexts=None, session_ids=None):
+        """Process many messages with a single intent-classification call
+        
+        `contexts` is one context per message, a single context for all of
+        them, or None for 'general'. Messages with a session id read and extend
+        that session's recent turns in the context store. With a response cache,
+        only cache misses are classified. A message that fails gets the
+        fallback reply without affecting the rest of the batch.
+        """
+        if contexts is None or isinstance(contexts, str):
+            contexts = [contexts or 'general'] * len(messages)
+        if session_ids is None:
+            session_ids = [None] * len(messages)
+        
+        cleaned = []
+        for message in messages:
+            try:
+                cleaned.append(self.preprocess_text(message))
+            except Exception:
+                cleaned.append(None)
+        valid = [i for i, text in enumerate(cleaned) if text is not None]
+        
+        # A session's later messages depend on the turns its earlier ones add,
+        # so their history (and cache lookup) waits until those are answered
+        seen, follow_ups = set(), set()
+        for i, session_id in enumerate(session_ids):
+            if session_id is not None:
+                if session_id in seen:
+                    follow_ups.add(i)
+                seen.add(session_id)
+        
+        cached = {}
+        if self.response_cache is not None:
+            for i in valid:
+                if i not in follow_ups:
+                    history = self.context_store.turns(session_ids[i]) if session_ids[i] is not None else ()
+                    hit = self.response_cache.get(self.response_key(cleaned[i], contexts[i], history))
+                    if hit is not None:
+                        cached[i] = hit
+        
+        pending = [i for i in valid if i not in cached]
+        try:
+            intents = dict(zip(pending, self._classify_clean([cleaned[i] for i in pending])))
+        except Exception:
+            intents = {}
+        
+        responses = []
+        for i, (message, context, session_id) in enumerate(zip(messages, contexts, session_ids)):
+            try:
+                # Only follow-ups still need a cache lookup; the rest were looked up above
+                intent = None if i in cached else intents[i]
+                parts = self._reply(
+                    message, cleaned[i], context, session_id, intent=intent, hit=cached.get(i), lookup=i in follow_ups
+                )
+                next(parts)
+                responses.append(''.join(parts))
+            except Exception:
+                responses.append(FALLBACK_RESPONSE)
+        return responses
+    
+    def process_message(self, message, context='general', session_id=None):
         """Main method to process user message and generate response"""
+        return self.process_batch([message], [context], [session_id])[0]
+
+    def process_message_stream(self, message, context='general', session_id=None):
+        """Yield a reply as events, each part as soon as it is ready
+        
+        Events are JSON-serialisable dicts: one 'start' with the intent and
+        topic, a 'chunk' per part (reply text, context suffix, suggestions),
+        and a final 'end' whose 'response' is the full reply, or the fallback
+        reply if processing failed part-way. A cached reply arrives as a
+        single chunk.
+        """
+        parts = []
         try:
-            # Classify intent
-            intent = self.classify_intent(message)
-            
-            # Check if user is asking about specific topic
-            message_lower = message.lower()
-            educational_topics = ['javascript', 'python', 'algebra', 'calculus', 'physics', 'chemistry']
-            
-            for topic in educational_topics:
-                if topic in message_lower:
-                    return self.generate_educational_content(topic)
-            
-            # Generate contextual response
-            response = self.get_contextual_response(message, context, intent)
-            
-            # Add learning suggestions
-            if intent in ['programming', 'mathematics', 'science']:
-                response += f"\n\nWould you like me to suggest some practice exercises for {intent}?"
-            
-            return response
-            
-        except Exception as e:
-            return "I'm having trouble processing that. Could you rephrase your question?"
+            events = self._reply(message, self.preprocess_text(message), context, session_id)
+            intent, topic = next(events)
+            yield {'event': 'start', 'intent': intent, 'topic': topic}
+            for text in events:
+                parts.append(text)
+                yield {'event': 'chunk', 'text': text}
+            yield {'event': 'end', 'response': ''.join(parts)}
+        except Exception:
+            yield {'event': 'end', 'response': FALLBACK_RESPONSE}
 
 def main():
     if len(sys.argv) < 2:
         print("Please provide a message")
         return
     
+    if sys.argv[1] == '--train':
+        # Offline training of the intent classifier
+        chatbot = EducationalChatbot()
+        try:
+            training_results = chatbot.train_intent_model(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_UTTERANCES)
+        except ValueError as e:
+            print(json.dumps({"error": str(e)}))
+            return
+        training_results['model_version'] = chatbot.save_intent_model(training_results)
+        print(json.dumps(training_results, indent=2))
+        return
+    
+    if sys.argv[1] == '--batch':
+        # One message per stdin line, plain text or {"message": ..., "context": ..., "session_id": ...};
+        # one JSON reply per output line, in input order
+        messages, contexts, session_ids = [], [], []
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            request = json.loads(line) if line.startswith('{') else {'message': line}
+            messages.append(request['message'])
+            contexts.append(request.get('context', sys.argv[2] if len(sys.argv) > 2 else 'general'))
+            session_ids.append(request.get('session_id'))
+        
+        chatbot = EducationalChatbot()
+        for response in chatbot.process_batch(messages, contexts, session_ids):
+            print(json.dumps({'response': response}))
+        return
+    
+    if sys.argv[1] == '--stream':
+        # Newline-delimited JSON events, flushed as each part of the reply is ready
+        if len(sys.argv) < 3:
+            print("Please provide a message")
+            return
+        chatbot = EducationalChatbot()
+        for event in chatbot.process_message_stream(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else 'general'):
+            print(json.dumps(event), flush=True)
+        return
+    
     message = sys.argv[1]
     context = sys.argv[2] if len(sys.argv) > 2 else 'general'
     
@@ -0,0 +1,52 @@
+import os
+import json
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+DEFAULT_KNOWLEDGE_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'knowledge_base.jsonl')
+
+
+class ContentIndex:
+    """TF-IDF retrieval over knowledge-base passages
+
+    Every passage is {"id", "topic", "kind", "text"}. The l2-normalised passage
+    matrix is built once and kept sparse; its column-major copy is the inverted
+    index (term -> passages containing it with their weights). A query only
+    touches the posting lists of its own terms, and summing query weight times
+    posting weight over them gives the cosine similarity of every passage that
+    shares a term with the query.
+    """
+
+    def __init__(self, passages):
+        self.passages = passages
+        self.topics = sorted({passage['topic'] for passage in passages})
+        self.vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True, dtype=np.float32)
+        # The topic is indexed with the text so 'what is python' reaches every python passage
+        self.matrix = self.vectorizer.fit_transform(
+            f"{passage['topic']} {passage['text']}" for passage in passages
+        ).tocsr()
+        self.postings = self.matrix.tocsc()
+        topics = np.array([passage['topic'] for passage in passages])
+        self.topic_rows = {topic: np.flatnonzero(topics == topic) for topic in self.topics}
+
+    @classmethod
+    def load(cls, path=DEFAULT_KNOWLEDGE_BASE):
+        """Build the index from a JSON-lines knowledge base"""
+        with open(path) as f:
+            return cls([json.loads(line) for line in f if line.strip()])
+
+    def scores(self, query):
+        """Cosine similarity of the query to every passage (zero where no term is shared)"""
+        query_vector = self.vectorizer.transform([query])
+        return self.postings[:, query_vector.indices] @ query_vector.data
+
+    def search(self, query, k=3, topic=None, min_score=0.0):
+        """Top-k (score, passage) pairs for a query, best first"""
+        scores = self.scores(query)
+        rows = self.topic_rows.get(topic, np.empty(0, dtype=int)) if topic is not None else np.arange(len(scores))
+        rows = rows[scores[rows] > min_score]
+        if rows.size > k:
+            rows = rows[np.argpartition(-scores[rows], k - 1)[:k]]
+        rows = rows[np.argsort(-scores[rows], kind='stable')]
+        return [(float(scores[row]), self.passages[row]) for row in rows]
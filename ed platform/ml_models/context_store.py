@@ -0,0 +1,83 @@
+import json
+import time
+import sqlite3
+import threading
+
+from caching import LRUCache
+
+
+class ConversationContextStore:
+    """Recent chat turns per session, bounded in turns, sessions, bytes and age
+
+    Each session keeps only its last `max_turns` turns as an immutable tuple of
+    (intent, topic, timestamp). Sessions live in an LRUCache, so the least
+    recently active ones are evicted once `max_sessions` or `max_bytes` is
+    reached, and idle sessions expire after `ttl_seconds`.
+
+    With `spill_path` every update is also written to a SQLite table. A session
+    evicted from memory, or lost to a restart, is then reloaded from disk on its
+    next turn, provided it has not expired.
+    """
+
+    def __init__(self, max_turns=8, max_sessions=100000, max_bytes=32 * 2 ** 20,
+                 ttl_seconds=1800, spill_path=None):
+        self.max_turns = max_turns
+        self.ttl_seconds = ttl_seconds
+        self.sessions = LRUCache(max_sessions, ttl_seconds, max_bytes)
+        # Reentrant: append reads the current turns while holding it
+        self.lock = threading.RLock()
+        self.spill = None
+        self.spill_writes = 0
+        if spill_path:
+            self.spill = sqlite3.connect(spill_path, check_same_thread=False, isolation_level=None)
+            self.spill.execute('PRAGMA journal_mode=WAL')
+            self.spill.execute('PRAGMA synchronous=NORMAL')
+            self.spill.execute(
+                'CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, turns TEXT, updated_at REAL)'
+            )
+
+    def _load(self, session_id):
+        row = self.spill.execute(
+            'SELECT turns FROM sessions WHERE session_id = ? AND updated_at >= ?',
+            (session_id, time.time() - self.ttl_seconds)
+        ).fetchone()
+        return tuple(tuple(turn) for turn in json.loads(row[0])) if row else None
+
+    def _save(self, session_id, turns):
+        self.spill.execute(
+            'INSERT OR REPLACE INTO sessions (session_id, turns, updated_at) VALUES (?, ?, ?)',
+            (session_id, json.dumps(turns), time.time())
+        )
+        self.spill_writes += 1
+        # Expired sessions are only read back to be ignored; drop them now and then
+        if self.spill_writes % 10000 == 0:
+            self.spill.execute('DELETE FROM sessions WHERE updated_at < ?', (time.time() - self.ttl_seconds,))
+
+    def turns(self, session_id):
+        """The session's recent turns, oldest first; empty for unknown sessions"""
+        turns = self.sessions.get(session_id)
+        if turns is None and self.spill is not None:
+            with self.lock:
+                turns = self._load(session_id)
+            if turns:
+                self.sessions.put(session_id, turns)
+        return turns or ()
+
+    def append(self, session_id, intent, topic=None):
+        """Record one turn, dropping the oldest beyond max_turns, and return the turns"""
+        with self.lock:
+            turns = (self.turns(session_id) + ((intent, topic, round(time.time(), 3)),))[-self.max_turns:]
+            self.sessions.put(session_id, turns)
+            if self.spill is not None:
+                self._save(session_id, turns)
+        return turns
+
+    def stats(self):
+        stats = self.sessions.stats()
+        stats['spill'] = self.spill is not None
+        return stats
+
+    def close(self):
+        if self.spill is not None:
+            self.spill.close()
+            self.spill = None
@@ -0,0 +1,63 @@
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.feather as feather
+except ImportError:  # Columnar datasets are optional; CSV still works
+    pa = None
+    pq = None
+    feather = None
+
+# Preferred first: columnar files can be memory-mapped and column-projected
+DATASET_EXTENSIONS = ('.parquet', '.feather', '.csv')
+
+
+def find_dataset(data_dir, name):
+    """Path of the best available file for a dataset name, or None"""
+    for extension in DATASET_EXTENSIONS:
+        if extension != '.csv' and pa is None:
+            continue
+        path = os.path.join(data_dir, name + extension)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _require_pyarrow(path):
+    if pa is None:
+        raise ImportError(f"Reading {path} requires pyarrow (pip install pyarrow)")
+
+
+def dataset_columns(path):
+    """Column names stored in a dataset file, read from metadata only"""
+    if path.endswith(('.parquet', '.feather')):
+        _require_pyarrow(path)
+    if path.endswith('.parquet'):
+        return pq.read_schema(path, memory_map=True).names
+    if path.endswith('.feather'):
+        return pa.ipc.open_file(pa.memory_map(path)).schema.names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def load_dataset(path, columns=None):
+    """Load a dataset file, reading only the requested columns that exist in it
+
+    Parquet and Feather files are memory-mapped, so unrequested columns are
+    never read from disk and dictionary columns arrive as pandas categoricals.
+    """
+    if columns is not None:
+        available = set(dataset_columns(path))
+        columns = [column for column in columns if column in available]
+
+    if path.endswith(('.parquet', '.feather')):
+        _require_pyarrow(path)
+        if path.endswith('.parquet'):
+            table = pq.read_table(path, columns=columns, memory_map=True)
+        else:
+            table = feather.read_table(path, columns=columns, memory_map=True)
+        return table.to_pandas()
+
+    return pd.read_csv(path, usecols=columns)
@@ -0,0 +1,62 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from dataset_loader import pa, load_dataset
+
+FEATURE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'features')
+
+
+class FeatureStore:
+    """Append-only store of training feature batches
+
+    Layout: <root>/<name>/<batch>.parquet (CSV when pyarrow is missing). Batch
+    ids are timestamps, so they sort in append order, and a written batch is
+    never modified: readers remember the last batch they consumed and ask for
+    everything after it.
+    """
+
+    def __init__(self, name, root=FEATURE_ROOT):
+        self.name = name
+        self.path = os.path.join(root, name)
+
+    def _batch_files(self):
+        if not os.path.isdir(self.path):
+            return {}
+        files = {}
+        for entry in os.listdir(self.path):
+            batch, extension = os.path.splitext(entry)
+            # Skip partially written batches
+            if not entry.startswith('.') and extension in ('.parquet', '.csv'):
+                files[batch] = os.path.join(self.path, entry)
+        return files
+
+    def append(self, df):
+        """Write a DataFrame as a new immutable batch and return its id"""
+        os.makedirs(self.path, exist_ok=True)
+        batch = datetime.now().strftime('%Y%m%d%H%M%S%f')
+        extension = '.parquet' if pa is not None else '.csv'
+        tmp_path = os.path.join(self.path, f'.{batch}{extension}.tmp')
+        if pa is not None:
+            df.to_parquet(tmp_path, index=False, engine='pyarrow')
+        else:
+            df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, os.path.join(self.path, batch + extension))
+        return batch
+
+    def batches(self, after=None):
+        """Batch ids in append order, optionally only those newer than `after`"""
+        return sorted(batch for batch in self._batch_files() if after is None or batch > after)
+
+    def read(self, after=None, columns=None):
+        """Concatenate the batches newer than `after`
+
+        Returns (DataFrame, last batch id), or (None, after) when nothing new.
+        """
+        files = self._batch_files()
+        batches = self.batches(after)
+        if not batches:
+            return None, after
+        frames = [load_dataset(files[batch], columns) for batch in batches]
+        return pd.concat(frames, ignore_index=True), batches[-1]
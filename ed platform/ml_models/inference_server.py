@@ -0,0 +1,262 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import inspect
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from caching import LRUCache
+from context_store import ConversationContextStore
+from micro_batcher import MicroBatcher
+from chatbot import EducationalChatbot
+from analytics_predictor import LearningAnalyticsPredictor
+from recommendation_engine import PersonalizedRecommendationEngine, parse_user_id
+
+DEFAULT_SOCKET = '/tmp/eduai-ml.sock'
+
+
+class InferenceServer:
+    """Resident service keeping the ML models warm behind a line-delimited JSON protocol
+
+    Each request is one JSON line: {"id": ..., "method": ..., "params": {...}}.
+    Each response is one JSON line: {"id": ..., "result": ...} or {"id": ..., "error": ...}.
+    Streaming methods first send {"id": ..., "event": {...}} lines as the
+    result is produced; their final result is the last event.
+    """
+
+    def __init__(self, max_workers=4, max_pending=64, prediction_cache=None, chat_batch_size=32, chat_batch_ms=2.0,
+                 context_store=None, response_cache=None):
+        self.started_at = time.time()
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='inference')
+        self.pending = asyncio.Semaphore(max_pending)
+        self.in_flight = 0
+        self.requests_served = 0
+
+        self.response_cache = response_cache or LRUCache()
+        self.chatbot = EducationalChatbot(context_store=context_store, response_cache=self.response_cache)
+        # Concurrent chat requests share one intent-classification call
+        self.chat_batcher = MicroBatcher(self.chat_batch, self.executor, chat_batch_size, chat_batch_ms)
+        self.recommender = PersonalizedRecommendationEngine(data_dir=os.environ.get('RECOMMENDER_DATA_DIR'))
+        # Shared by every predictor this server loads; each load clears it
+        self.prediction_cache = prediction_cache or LRUCache()
+        self.predictor = LearningAnalyticsPredictor(prediction_cache=self.prediction_cache)
+        self.reload_lock = threading.Lock()
+        try:
+            self.predictor.load_models()
+        except FileNotFoundError:
+            # Serve chat/recommendations anyway; predict reports the missing artifact
+            pass
+        try:
+            self.recommender_version = self.recommender.load_latent_factors()
+        except FileNotFoundError:
+            self.recommender_version = None
+
+        self.methods = {
+            'health': self.health,
+            'chat': self.chat,
+            'chat_stream': self.chat_stream,
+            'predict': self.predict,
+            'recommend': self.recommend
+        }
+
+    def health(self, params):
+        """Report liveness, load and model versions"""
+        return {
+            'status': 'ok',
+            'uptime_seconds': round(time.time() - self.started_at, 3),
+            'workers': self.max_workers,
+            'in_flight': self.in_flight,
+            'requests_served': self.requests_served,
+            'models': {
+                'chatbot': True,
+                'recommendation_engine': self.recommender_version or True,
+                'analytics_predictor': self.predictor.model_version
+            },
+            'prediction_cache': self.prediction_cache.stats(),
+            'chat_batching': self.chat_batcher.stats(),
+            'chat_sessions': self.chatbot.context_store.stats(),
+            'response_cache': self.response_cache.stats()
+        }
+
+    async def chat(self, params):
+        request = (params['message'], params.get('context', 'general'), params.get('session_id'))
+        response = await self.chat_batcher.submit(request)
+        return {'response': response}
+
+    def chat_stream(self, params):
+        yield from self.chatbot.process_message_stream(
+            params['message'], params.get('context', 'general'), params.get('session_id')
+        )
+
+    def chat_batch(self, requests):
+        """Answer a list of (message, context, session_id) requests in one chatbot call"""
+        messages, contexts, session_ids = zip(*requests)
+        return self.chatbot.process_batch(list(messages), list(contexts), list(session_ids))
+
+    def current_predictor(self):
+        """Return the predictor for the latest published artifact version
+        
+        A newer version is loaded into a fresh predictor and swapped in as one
+        reference, so requests already running keep a consistent old model.
+        """
+        latest = self.predictor.artifact_store.latest_version()
+        if latest is not None and latest != self.predictor.model_version:
+            with self.reload_lock:
+                if latest != self.predictor.model_version:
+                    predictor = LearningAnalyticsPredictor(prediction_cache=self.prediction_cache)
+                    predictor.load_models(latest)
+                    self.predictor = predictor
+        return self.predictor
+    
+    def predict(self, params):
+        predictor = self.current_predictor()
+        if predictor.model_version is None:
+            raise RuntimeError("No trained models found. Run: python ml_models/analytics_predictor.py train")
+        return {
+            'predictions': predictor.predict_student_outcomes(params['student']),
+            'model_version': predictor.model_version
+        }
+
+    def recommend(self, params):
+        return self.recommender.hybrid_recommendations(parse_user_id(params['user_id']), int(params.get('num_recommendations', 5)))
+
+    async def stream(self, method, params, send=None):
+        """Run a generator method on the worker pool, sending each event as soon as it is produced"""
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+
+        def produce():
+            try:
+                for event in method(params):
+                    loop.call_soon_threadsafe(events.put_nowait, event)
+            finally:
+                loop.call_soon_threadsafe(events.put_nowait, None)
+
+        producer = loop.run_in_executor(self.executor, produce)
+        last = None
+        while (event := await events.get()) is not None:
+            last = event
+            if send is not None:
+                await send(event)
+        await producer
+        return last
+
+    async def dispatch(self, request, send=None):
+        """Run one request on the bounded worker pool; `send` receives streamed events"""
+        request_id = request.get('id')
+        method = self.methods.get(request.get('method'))
+        if method is None:
+            return {'id': request_id, 'error': f"Unknown method: {request.get('method')}"}
+
+        # Health checks must answer even when every worker is busy
+        if method == self.health:
+            return {'id': request_id, 'result': method(request.get('params') or {})}
+
+        async with self.pending:
+            self.in_flight += 1
+            try:
+                if inspect.isgeneratorfunction(method):
+                    result = await self.stream(method, request.get('params') or {}, send)
+                elif asyncio.iscoroutinefunction(method):
+                    # Batched methods schedule their own work on the pool
+                    result = await method(request.get('params') or {})
+                else:
+                    loop = asyncio.get_running_loop()
+                    result = await loop.run_in_executor(self.executor, method, request.get('params') or {})
+                return {'id': request_id, 'result': result}
+            except Exception as e:
+                return {'id': request_id, 'error': str(e)}
+            finally:
+                self.in_flight -= 1
+                self.requests_served += 1
+
+    async def handle_connection(self, reader, writer):
+        """Serve one client connection; requests on it may complete out of order"""
+        write_lock = asyncio.Lock()
+
+        async def write(message):
+            async with write_lock:
+                writer.write((json.dumps(message, default=float) + '\n').encode())
+                await writer.drain()
+
+        async def respond(request):
+            async def send(event):
+                await write({'id': request.get('id'), 'event': event})
+
+            await write(await self.dispatch(request, send))
+
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    async with write_lock:
+                        writer.write((json.dumps({'id': None, 'error': f'Invalid JSON: {e}'}) + '\n').encode())
+                    continue
+                task = asyncio.create_task(respond(request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path=None, host=None, port=None):
+        if port is not None:
+            server = await asyncio.start_server(self.handle_connection, host or '127.0.0.1', port)
+        else:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            server = await asyncio.start_unix_server(self.handle_connection, socket_path)
+
+        print(json.dumps({'event': 'ready', 'socket': socket_path, 'port': port}), flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resident inference server for the EduAI ML models')
+    parser.add_argument('--socket', default=os.environ.get('ML_SOCKET', DEFAULT_SOCKET))
+    parser.add_argument('--host', default=None)
+    parser.add_argument('--port', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--max-pending', type=int, default=64)
+    parser.add_argument('--cache-entries', type=int, default=10000, help='prediction cache size')
+    parser.add_argument('--cache-ttl', type=float, default=300, help='prediction cache TTL in seconds')
+    parser.add_argument('--cache-mb', type=float, default=64, help='prediction cache memory cap')
+    parser.add_argument('--chat-batch-size', type=int, default=32, help='most chat requests per batch')
+    parser.add_argument('--chat-batch-ms', type=float, default=2.0, help='chat batching window under load')
+    parser.add_argument('--response-cache-entries', type=int, default=50000, help='chat response cache size')
+    parser.add_argument('--response-cache-ttl', type=float, default=3600, help='chat response cache TTL in seconds')
+    parser.add_argument('--context-sessions', type=int, default=100000, help='chat sessions kept in memory')
+    parser.add_argument('--context-ttl', type=float, default=1800, help='idle seconds before a chat session expires')
+    parser.add_argument('--context-db', default=os.environ.get('CHAT_CONTEXT_DB'),
+                        help='SQLite file that chat sessions spill to, so they survive restarts')
+    args = parser.parse_args()
+
+    prediction_cache = LRUCache(args.cache_entries, args.cache_ttl, int(args.cache_mb * 2 ** 20))
+    context_store = ConversationContextStore(
+        max_sessions=args.context_sessions, ttl_seconds=args.context_ttl, spill_path=args.context_db
+    )
+    response_cache = LRUCache(args.response_cache_entries, args.response_cache_ttl)
+    server = InferenceServer(
+        max_workers=args.workers, max_pending=args.max_pending, prediction_cache=prediction_cache,
+        chat_batch_size=args.chat_batch_size, chat_batch_ms=args.chat_batch_ms, context_store=context_store,
+        response_cache=response_cache
+    )
+    try:
+        asyncio.run(server.serve(socket_path=args.socket, host=args.host, port=args.port))
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=65536)
+def normalize_word(word):
+    """Reduce plural, -ing and -ful forms to a shared stem ('functions' -> 'function')
+
+    Only consistent, not linguistic: keywords and message tokens go through the
+    same rules, so 'coding' and 'code' both become 'cod'.
+    """
+    if word.endswith('ies') and len(word) > 4:
+        word = word[:-3] + 'y'
+    elif word.endswith(('sses', 'xes', 'zes', 'ches', 'shes')):
+        word = word[:-2]
+    elif word.endswith('s') and len(word) > 3 and not word.endswith(('ss', 'us', 'is')):
+        word = word[:-1]
+
+    if word.endswith('ing') and len(word) > 5:
+        word = word[:-3]
+        # programming -> program
+        if len(word) > 3 and word[-1] == word[-2] and word[-1] not in 'aeiousl':
+            word = word[:-1]
+    elif word.endswith('ful') and len(word) > 5:
+        word = word[:-3]
+
+    if word.endswith('e') and len(word) > 3 and not word.endswith('ee'):
+        word = word[:-1]
+    return word
+
+
+def intent_tokens(text):
+    """Tokenizer of the intent model: whitespace tokens reduced by normalize_word
+
+    Kept in its own module so pickled intent pipelines reference
+    `intent_text.intent_tokens`, whichever script trained them.
+    """
+    return [normalize_word(token) for token in text.split()]
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+
+class InteractionIndex:
+    """Sparse user x course rating matrix with neighbour search
+
+    Built once from (user_id, course_id, rating) rows. The CSR matrix, its
+    L2-normalised rows and the transposed item->user index are built lazily,
+    on the first query. Repeated ratings of the same pair are averaged,
+    matching the former pivot_table.
+    """
+
+    def __init__(self, user_ids, course_ids, ratings):
+        user_positions, user_uniques = pd.factorize(pd.Series(user_ids))
+        course_positions, course_uniques = pd.factorize(pd.Series(course_ids))
+        self.user_ids = user_uniques.tolist()
+        self.course_ids = course_uniques.tolist()
+        self.user_index = {user_id: position for position, user_id in enumerate(self.user_ids)}
+        self.course_index = {course_id: position for position, course_id in enumerate(self.course_ids)}
+        self._rows = user_positions.astype(np.int32)
+        self._cols = course_positions.astype(np.int32)
+        self._ratings = np.asarray(ratings, dtype=np.float32)
+        self._matrix = None
+        self._normalized = None
+        self._normalized_t = None
+
+    @classmethod
+    def from_frame(cls, interactions_df, user_col='user_id', course_col='course_id', rating_col='rating'):
+        return cls(interactions_df[user_col], interactions_df[course_col], interactions_df[rating_col])
+
+    def _build(self):
+        rows, cols, ratings = self._rows, self._cols, self._ratings
+        shape = (len(self.user_ids), len(self.course_ids))
+        sums = sparse.csr_matrix((ratings, (rows, cols)), shape=shape, dtype=np.float32)
+        counts = sparse.csr_matrix((np.ones_like(ratings), (rows, cols)), shape=shape, dtype=np.float32)
+        sums.sum_duplicates()
+        counts.sum_duplicates()
+        sums.data /= counts.data
+
+        self._matrix = sums
+        self._normalized = normalize(sums, norm='l2', axis=1)
+        self._normalized_t = self._normalized.T.tocsr()
+
+    def _ensure_built(self):
+        if self._matrix is None:
+            self._build()
+
+    @property
+    def matrix(self):
+        """CSR ratings matrix (users x courses)"""
+        self._ensure_built()
+        return self._matrix
+
+    def __contains__(self, user_id):
+        return user_id in self.user_index
+
+    def user_ratings(self, user_id):
+        """Return (course_ids, ratings) rated by a user"""
+        row = self.matrix[self.user_index[user_id]]
+        return [self.course_ids[col] for col in row.indices], row.data
+
+    def _top_k(self, users, sims, exclude, k):
+        if k <= 0:
+            return []
+        keep = users != exclude
+        users, sims = users[keep], sims[keep]
+        if len(sims) > k:
+            candidates = np.argpartition(-sims, k - 1)[:k]
+            users, sims = users[candidates], sims[candidates]
+        order = np.argsort(-sims, kind='stable')
+        return [(self.user_ids[u], float(s)) for u, s in zip(users[order], sims[order])]
+
+    def neighbours(self, user_id, k=3):
+        """Top-k most similar other users as (user_id, similarity), best first
+
+        Only users sharing at least one course with `user_id` are ever touched:
+        the product with the item->user index yields a sparse similarity row.
+        """
+        self._ensure_built()
+        row = self.user_index[user_id]
+        sims = self._normalized[row] @ self._normalized_t
+        return self._top_k(sims.indices, sims.data, row, k)
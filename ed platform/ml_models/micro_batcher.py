@@ -0,0 +1,85 @@
+import asyncio
+
+
+class MicroBatcher:
+    """Coalesce concurrent asyncio requests into batched calls on a worker pool
+
+    `process_batch` takes a list of items and returns one result per item. An
+    item arriving while no batch is running is dispatched straight away, after
+    draining whatever is already queued, so a lone request pays no window.
+    Under load it waits up to `max_wait_ms` for more items, or until
+    `max_batch_size` have arrived, before dispatching.
+    """
+
+    def __init__(self, process_batch, executor=None, max_batch_size=32, max_wait_ms=2.0):
+        self.process_batch = process_batch
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.collector = None
+        self.tasks = set()
+        self.running = 0
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    async def submit(self, item):
+        """Queue one item and wait for its result"""
+        if self.collector is None or self.collector.done():
+            self.collector = asyncio.create_task(self._collect())
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            # Let requests sent in the same event-loop tick join the batch
+            await asyncio.sleep(0)
+            if self.running:
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            while len(batch) < self.max_batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            self.running += 1
+            task = asyncio.create_task(self._run(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _run(self, batch):
+        items = [item for item, _ in batch]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self.executor, self.process_batch, items)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self.running -= 1
+            self.batches += 1
+            self.items += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'mean_batch_size': round(self.items / self.batches, 2) if self.batches else 0.0,
+            'largest_batch': self.largest_batch,
+            'queued': self.queue.qsize(),
+            'running': self.running
+        }
@@ -0,0 +1,98 @@
+import os
+import json
+import hashlib
+from datetime import datetime
+
+import joblib
+
+ARTIFACT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'artifacts')
+
+
+class ArtifactChecksumError(Exception):
+    """Raised when a stored artifact does not match its recorded checksum"""
+
+
+class ModelArtifactStore:
+    """Versioned on-disk store for fitted model artifacts
+
+    Layout: <root>/<name>/<version>/{<key>.joblib, metadata.json} plus a
+    <root>/<name>/LATEST pointer that is swapped atomically on save.
+    """
+
+    def __init__(self, name, root=ARTIFACT_ROOT):
+        self.name = name
+        self.path = os.path.join(root, name)
+
+    def _version_dir(self, version):
+        return os.path.join(self.path, version)
+
+    @staticmethod
+    def _checksum(file_path):
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def save(self, objects, metadata=None):
+        """Persist a dict of fitted objects as a new version and mark it latest"""
+        version = datetime.now().strftime('%Y%m%d%H%M%S%f')
+        version_dir = self._version_dir(version)
+        os.makedirs(version_dir, exist_ok=True)
+
+        files = {}
+        for key, obj in objects.items():
+            file_name = f'{key}.joblib'
+            file_path = os.path.join(version_dir, file_name)
+            # Uncompressed dumps keep numpy buffers mmap-able on load
+            joblib.dump(obj, file_path)
+            files[key] = {'file': file_name, 'sha256': self._checksum(file_path)}
+
+        record = {
+            'name': self.name,
+            'version': version,
+            'created_at': datetime.now().isoformat(),
+            'files': files,
+            'metadata': metadata or {}
+        }
+        with open(os.path.join(version_dir, 'metadata.json'), 'w') as f:
+            json.dump(record, f, indent=2, default=float)
+
+        latest_tmp = os.path.join(self.path, 'LATEST.tmp')
+        with open(latest_tmp, 'w') as f:
+            f.write(version)
+        os.replace(latest_tmp, os.path.join(self.path, 'LATEST'))
+
+        return version
+
+    def latest_version(self):
+        """Return the version currently marked latest, or None"""
+        try:
+            with open(os.path.join(self.path, 'LATEST')) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def read_metadata(self, version=None):
+        """Read the metadata record of a version (latest by default)"""
+        version = version or self.latest_version()
+        if version is None:
+            return None
+        with open(os.path.join(self._version_dir(version), 'metadata.json')) as f:
+            return json.load(f)
+
+    def load(self, version=None, mmap_mode='r', verify=True):
+        """Load all objects of a version, memory-mapping numpy buffers"""
+        record = self.read_metadata(version)
+        if record is None:
+            raise FileNotFoundError(f"No artifacts stored for '{self.name}' in {self.path}")
+
+        version_dir = self._version_dir(record['version'])
+        objects = {}
+        for key, entry in record['files'].items():
+            file_path = os.path.join(version_dir, entry['file'])
+            if verify and self._checksum(file_path) != entry['sha256']:
+                raise ArtifactChecksumError(f"Checksum mismatch for {file_path}")
+            objects[key] = joblib.load(file_path, mmap_mode=mmap_mode)
+
+        return objects, record
@@ -4,19 +4,232 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.decomposition import TruncatedSVD
 from sklearn.cluster import KMeans
+from sklearn.base import clone
 import json
 import sys
+import os
+import ast
+import hashlib
+import threading
+
+from interaction_index import InteractionIndex
+from dataset_loader import find_dataset, load_dataset
+from model_store import ModelArtifactStore
+
+# Inclusive difficulty_score / duration_hours bands matched against the user profile
+SKILL_LEVEL_DIFFICULTY = {
+    'beginner': (-np.inf, 5),
+    'intermediate': (4, 7),
+    'advanced': (6, np.inf)
+}
+
+LEARNING_PACE_DURATION = {
+    'fast': (-np.inf, 12),
+    'normal': (10, 18),
+    'slow': (15, np.inf)
+}
+
+def band_mask(values, band):
+    """Boolean mask of values falling inside an inclusive (low, high) band"""
+    if band is None:
+        return np.zeros(len(values), dtype=bool)
+    low, high = band
+    return (values >= low) & (values <= high)
+
+# Generated datasets (datasets/education_data_generator.py) use these column names
+GENERATED_INTERACTION_COLUMNS = {
+    'student_id': 'user_id',
+    'satisfaction_rating': 'rating',
+    'time_spent_hours': 'time_spent'
+}
+
+# Columns the engine reads; both engine and generated names are listed so
+# column projection works for either layout
+COURSE_COLUMNS = [
+    'course_id', 'title', 'category', 'level', 'skills', 'skills_taught',
+    'difficulty_score', 'duration_hours'
+]
+
+INTERACTION_COLUMNS = [
+    'user_id', 'student_id', 'course_id', 'rating', 'satisfaction_rating',
+    'completion_rate', 'progress_percentage', 'time_spent', 'time_spent_hours'
+]
+
+def _join_skills(value):
+    if isinstance(value, str) and value.startswith('['):
+        value = ast.literal_eval(value)
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return ' '.join(value)
+    return str(value)
+
+def normalize_courses(courses_df):
+    """Map a generated course dataset onto the engine's column names"""
+    if 'skills' not in courses_df.columns and 'skills_taught' in courses_df.columns:
+        courses_df['skills'] = courses_df['skills_taught'].map(_join_skills)
+    return courses_df
+
+def normalize_interactions(interactions_df):
+    """Map a generated interaction dataset onto the engine's column names"""
+    renames = {
+        source: target for source, target in GENERATED_INTERACTION_COLUMNS.items()
+        if source in interactions_df.columns and target not in interactions_df.columns
+    }
+    interactions_df = interactions_df.rename(columns=renames)
+    if 'completion_rate' not in interactions_df.columns and 'progress_percentage' in interactions_df.columns:
+        interactions_df['completion_rate'] = interactions_df['progress_percentage'] / 100
+    return interactions_df
+
+def parse_user_id(value):
+    """Numeric ids for the sample data, string ids (e.g. 'STU_0001') for generated data"""
+    value = str(value)
+    return int(value) if value.isdigit() else value
+
+def top_k_indices(scores, k):
+    """Indices of the k highest scores, best first"""
+    if k <= 0 or len(scores) == 0:
+        return np.array([], dtype=int)
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+def catalog_signature(course_ids, user_ids):
+    """Order-independent digest of a catalog's course and user ids"""
+    digest = hashlib.blake2b(digest_size=16)
+    for ids in (course_ids, user_ids):
+        digest.update('\n'.join(sorted(map(str, ids))).encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+class CatalogSnapshot:
+    """Loaded course and interaction frames with every index derived from them
+    
+    A snapshot is fully built before the engine publishes it, and never
+    changes afterwards (apart from the lazily built interaction index), so a
+    request holding one cannot mix frames and indexes from different loads.
+    """
+    
+    def __init__(self, courses_df, interactions_df, signature, tfidf):
+        self.courses_df = courses_df
+        self.interactions_df = interactions_df
+        self.signature = signature
+        
+        course_ids = courses_df['course_id'].tolist()
+        self.course_positions = dict(zip(course_ids, range(len(course_ids))))
+        
+        # Interaction rows grouped by user: user_id -> (start, end) offsets into the sorted order
+        user_ids = interactions_df['user_id'].to_numpy()
+        order = np.argsort(user_ids, kind='stable')
+        unique_ids, starts = np.unique(user_ids[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        self.user_interaction_order = order
+        self.user_offsets = dict(zip(unique_ids.tolist(), zip(starts.tolist(), ends.tolist())))
+        
+        self.course_skill_matrix = clone(tfidf).fit_transform(courses_df['skills'])
+        self.catalog = catalog_signature(course_ids, self.user_offsets)
+        self._interaction_index = None
+        self._index_lock = threading.Lock()
+    
+    def user_interaction_rows(self, user_id):
+        """Positional rows of interactions_df belonging to a user"""
+        start, end = self.user_offsets.get(user_id, (0, 0))
+        return self.user_interaction_order[start:end]
+    
+    def course_rows(self, course_ids):
+        """Positional rows of courses_df for the given course ids"""
+        return np.array([self.course_positions[course_id] for course_id in course_ids], dtype=int)
+    
+    def interaction_index(self):
+        """Sparse user x course index, built once on first use"""
+        if self._interaction_index is None:
+            with self._index_lock:
+                if self._interaction_index is None:
+                    index = InteractionIndex.from_frame(self.interactions_df)
+                    index.matrix  # build the lazy matrices before publishing
+                    self._interaction_index = index
+        return self._interaction_index
+    
+    def align_latent(self, model):
+        """Item embeddings reordered to catalog rows, or None for a model trained on another catalog"""
+        if model is None or model.get('catalog') != self.catalog:
+            return None
+        aligned = np.zeros((len(self.courses_df), model['item_factors'].shape[1]), dtype=np.float32)
+        for i, course_id in enumerate(model['course_ids']):
+            row = self.course_positions.get(course_id)
+            if row is not None:
+                aligned[row] = model['item_factors'][i]
+        # Cold-start users borrow the centroid of the largest segment
+        largest_segment = np.bincount(model['user_segments']).argmax()
+        return {
+            'model': model,
+            'user_positions': {user_id: i for i, user_id in enumerate(model['user_ids'])},
+            'item_factors': aligned,
+            'cold_start_vector': model['segment_centroids'][largest_segment]
+        }
 
 class PersonalizedRecommendationEngine:
-    def __init__(self):
+    def __init__(self, data_dir=None, artifact_store=None):
         self.tfidf = TfidfVectorizer(max_features=1000, stop_words='english')
         self.svd = TruncatedSVD(n_components=50)
         self.kmeans = KMeans(n_clusters=5, random_state=42)
         self.user_profiles = {}
         self.course_features = {}
+        self.artifact_store = artifact_store or ModelArtifactStore('recommendation_factors')
+        self.latent_model = None
+        self.data_dir = data_dir
+        # (CatalogSnapshot, aligned latent factors or None), replaced as one reference
+        self.state = (None, None)
+        self._datasets_lock = threading.Lock()
+    
+    @property
+    def courses_df(self):
+        return self.state[0].courses_df if self.state[0] is not None else None
+    
+    @property
+    def interactions_df(self):
+        return self.state[0].interactions_df if self.state[0] is not None else None
         
+    def _dataset_files(self):
+        if self.data_dir is None:
+            return None
+        files = (find_dataset(self.data_dir, 'courses'), find_dataset(self.data_dir, 'interactions'))
+        return files if all(files) else None
+    
+    def current_state(self):
+        """The published (snapshot, latent) pair, reloading first if the source files changed
+        
+        A new snapshot and its latent alignment are built in locals and
+        published with one assignment, so concurrent requests see either the
+        old pair or the new one, never a mix.
+        """
+        files = self._dataset_files()
+        if files:
+            signature = tuple((os.stat(f).st_mtime_ns, os.stat(f).st_size) for f in files)
+        else:
+            signature = 'sample'
+        
+        state = self.state
+        if state[0] is None or state[0].signature != signature:
+            with self._datasets_lock:
+                state = self.state
+                if state[0] is None or state[0].signature != signature:
+                    if files:
+                        courses_df = normalize_courses(load_dataset(files[0], COURSE_COLUMNS))
+                        interactions_df = normalize_interactions(load_dataset(files[1], INTERACTION_COLUMNS))
+                    else:
+                        courses_df, interactions_df = self.sample_datasets()
+                    snapshot = CatalogSnapshot(courses_df, interactions_df, signature, self.tfidf)
+                    state = self.state = (snapshot, snapshot.align_latent(self.latent_model))
+        return state
+    
     def load_datasets(self):
-        """Load custom educational datasets"""
+        """Load educational datasets, reusing the cached frames until the source files change"""
+        snapshot = self.current_state()[0]
+        return snapshot.courses_df, snapshot.interactions_df
+    
+    def sample_datasets(self):
+        """Built-in sample datasets used when no data directory is configured"""
         # Sample course dataset
         courses_data = {
             'course_id': [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
@@ -61,14 +274,15 @@ class PersonalizedRecommendationEngine:
             'time_spent': [10, 14, 8, 9, 10, 15, 12, 6, 8, 22, 5, 10]
         }
         
-        self.courses_df = pd.DataFrame(courses_data)
-        self.interactions_df = pd.DataFrame(user_interactions)
-        
-        return self.courses_df, self.interactions_df
+        return pd.DataFrame(courses_data), pd.DataFrame(user_interactions)
     
-    def build_user_profile(self, user_id, interactions_df):
+    def build_user_profile(self, user_id, interactions_df, snapshot=None):
         """Build user learning profile based on interactions"""
-        user_data = interactions_df[interactions_df['user_id'] == user_id]
+        snapshot = snapshot or self.current_state()[0]
+        if interactions_df is snapshot.interactions_df:
+            user_data = interactions_df.iloc[snapshot.user_interaction_rows(user_id)]
+        else:
+            user_data = interactions_df[interactions_df['user_id'] == user_id]
         
         if user_data.empty:
             return {
@@ -92,10 +306,7 @@ class PersonalizedRecommendationEngine:
             pace = 'normal'
         
         # Determine skill level based on course difficulty
-        course_difficulties = []
-        for course_id in user_data['course_id']:
-            difficulty = self.courses_df[self.courses_df['course_id'] == course_id]['difficulty_score'].iloc[0]
-            course_difficulties.append(difficulty)
+        course_difficulties = snapshot.courses_df['difficulty_score'].to_numpy()[snapshot.course_rows(user_data['course_id'])]
         
         avg_difficulty = np.mean(course_difficulties)
         if avg_difficulty >= 7:
@@ -113,124 +324,214 @@ class PersonalizedRecommendationEngine:
             'preferred_difficulty': avg_difficulty
         }
     
-    def content_based_recommendations(self, user_id, num_recommendations=5):
+    def content_based_recommendations(self, user_id, num_recommendations=5, state=None):
         """Generate content-based recommendations"""
-        courses_df, interactions_df = self.load_datasets()
-        user_profile = self.build_user_profile(user_id, interactions_df)
+        snapshot = (state or self.current_state())[0]
+        courses_df, interactions_df = snapshot.courses_df, snapshot.interactions_df
+        user_profile = self.build_user_profile(user_id, interactions_df, snapshot)
         
         # Get courses user has already taken
-        user_courses = interactions_df[interactions_df['user_id'] == user_id]['course_id'].tolist()
-        
-        # Filter out already taken courses
-        available_courses = courses_df[~courses_df['course_id'].isin(user_courses)]
+        taken = np.zeros(len(courses_df), dtype=bool)
+        taken[snapshot.course_rows(interactions_df['course_id'].to_numpy()[snapshot.user_interaction_rows(user_id)])] = True
         
-        if available_courses.empty:
+        if taken.all():
             return []
         
-        # Create TF-IDF matrix for course skills
-        tfidf_matrix = self.tfidf.fit_transform(available_courses['skills'])
+        # Skill similarity between the candidates and the courses the user already took
+        tfidf_matrix = snapshot.course_skill_matrix
+        if taken.any():
+            interest_vector = np.asarray(tfidf_matrix[taken].mean(axis=0))
+            skill_similarity = cosine_similarity(tfidf_matrix, interest_vector).ravel()
+        else:
+            skill_similarity = np.zeros(len(courses_df))
+        
+        # Skill level and learning pace matching over whole columns
+        difficulty = courses_df['difficulty_score'].to_numpy()
+        duration = courses_df['duration_hours'].to_numpy()
+        level_match = band_mask(difficulty, SKILL_LEVEL_DIFFICULTY.get(user_profile['skill_level']))
+        pace_match = band_mask(duration, LEARNING_PACE_DURATION.get(user_profile['learning_pace']))
+        
+        # Add some randomness for diversity
+        scores = (
+            0.3 * level_match +
+            0.2 * pace_match +
+            0.4 * skill_similarity +
+            0.1 * np.random.random(len(courses_df))
+        )
+        
+        candidates = np.flatnonzero(~taken)
+        best = candidates[top_k_indices(scores[candidates], num_recommendations)]
+        
+        reason = f"Matches your {user_profile['skill_level']} level and {user_profile['learning_pace']} learning pace"
+        selected = courses_df.iloc[best]
+        return [
+            {
+                'course_id': course_id,
+                'title': title,
+                'category': category,
+                'level': level,
+                'score': float(score),
+                'reason': reason
+            }
+            for course_id, title, category, level, score in zip(
+                selected['course_id'].tolist(), selected['title'].tolist(),
+                selected['category'].tolist(), selected['level'].tolist(), scores[best]
+            )
+        ]
+    
+    def collaborative_filtering_recommendations(self, user_id, num_recommendations=5, state=None):
+        """Generate collaborative filtering recommendations"""
+        state = state or self.current_state()
+        snapshot = state[0]
+        courses_df = snapshot.courses_df
+        index = snapshot.interaction_index()
         
-        # Calculate similarity scores based on user profile
+        if user_id not in index:
+            return self.content_based_recommendations(user_id, num_recommendations, state)
+        
+        # Find similar users
+        similar_users = index.neighbours(user_id, k=3)
+        user_courses = set(index.user_ratings(user_id)[0])
+        
+        # Get courses liked by similar users; neighbours arrive best first,
+        # so the first occurrence of a course carries its highest score
         recommendations = []
+        seen_courses = set()
+        for similar_user_id, similarity_score in similar_users:
+            course_ids, ratings = index.user_ratings(similar_user_id)
+            for course_id, rating in zip(course_ids, ratings):
+                if rating < 4 or course_id in user_courses or course_id in seen_courses:
+                    continue
+                seen_courses.add(course_id)
+                course_info = courses_df.iloc[snapshot.course_positions[course_id]]
+                recommendations.append({
+                    'course_id': course_id,
+                    'title': course_info['title'],
+                    'category': course_info['category'],
+                    'level': course_info['level'],
+                    'score': similarity_score,
+                    'reason': f"Users with similar interests rated this highly"
+                })
         
-        for idx, course in available_courses.iterrows():
-            score = 0
-            
-            # Skill level matching
-            if user_profile['skill_level'] == 'beginner' and course['difficulty_score'] <= 5:
-                score += 0.3
-            elif user_profile['skill_level'] == 'intermediate' and 4 <= course['difficulty_score'] <= 7:
-                score += 0.3
-            elif user_profile['skill_level'] == 'advanced' and course['difficulty_score'] >= 6:
-                score += 0.3
-            
-            # Learning pace matching
-            if user_profile['learning_pace'] == 'fast' and course['duration_hours'] <= 12:
-                score += 0.2
-            elif user_profile['learning_pace'] == 'normal' and 10 <= course['duration_hours'] <= 18:
-                score += 0.2
-            elif user_profile['learning_pace'] == 'slow' and course['duration_hours'] >= 15:
-                score += 0.2
-            
-            # Add some randomness for diversity
-            score += np.random.random() * 0.1
-            
-            recommendations.append({
-                'course_id': course['course_id'],
-                'title': course['title'],
-                'category': course['category'],
-                'level': course['level'],
-                'score': score,
-                'reason': f"Matches your {user_profile['skill_level']} level and {user_profile['learning_pace']} learning pace"
-            })
-        
-        # Sort by score and return top recommendations
         recommendations.sort(key=lambda x: x['score'], reverse=True)
         return recommendations[:num_recommendations]
     
-    def collaborative_filtering_recommendations(self, user_id, num_recommendations=5):
-        """Generate collaborative filtering recommendations"""
-        courses_df, interactions_df = self.load_datasets()
-        
-        # Create user-item matrix
-        user_item_matrix = interactions_df.pivot_table(
-            index='user_id', 
-            columns='course_id', 
-            values='rating', 
-            fill_value=0
-        )
+    def train_latent_factors(self, n_components=50, n_segments=5):
+        """Fit SVD user/item embeddings and KMeans user segments over the interaction matrix"""
+        snapshot = self.current_state()[0]
+        index = snapshot.interaction_index()
+        matrix = index.matrix
+        
+        # TruncatedSVD needs fewer components than either matrix dimension
+        n_components = max(1, min(n_components, matrix.shape[0] - 1, matrix.shape[1] - 1))
+        self.svd = TruncatedSVD(n_components=n_components, random_state=42)
+        user_factors = self.svd.fit_transform(matrix).astype(np.float32)
+        item_factors = self.svd.components_.T.astype(np.float32)
         
-        # Calculate user similarity
-        user_similarity = cosine_similarity(user_item_matrix)
-        user_similarity_df = pd.DataFrame(
-            user_similarity, 
-            index=user_item_matrix.index, 
-            columns=user_item_matrix.index
+        self.kmeans = KMeans(n_clusters=min(n_segments, matrix.shape[0]), random_state=42, n_init=10)
+        user_segments = self.kmeans.fit_predict(user_factors)
+        
+        self.latent_model = {
+            'user_ids': list(index.user_ids),
+            'course_ids': list(index.course_ids),
+            'user_factors': user_factors,
+            'item_factors': item_factors,
+            'segment_centroids': self.kmeans.cluster_centers_.astype(np.float32),
+            'user_segments': user_segments.astype(np.int32),
+            'explained_variance': float(self.svd.explained_variance_ratio_.sum()),
+            'catalog': snapshot.catalog
+        }
+        self._publish_latent(snapshot)
+        return {
+            'n_components': n_components,
+            'n_segments': int(self.kmeans.n_clusters),
+            'explained_variance': self.latent_model['explained_variance']
+        }
+    
+    def save_latent_factors(self):
+        """Persist the trained latent-factor model as a new artifact version"""
+        model = self.latent_model
+        return self.artifact_store.save(
+            {
+                'factors': {key: model[key] for key in ('user_factors', 'item_factors', 'segment_centroids', 'user_segments')},
+                'ids': {'user_ids': model['user_ids'], 'course_ids': model['course_ids']}
+            },
+            {'explained_variance': model['explained_variance'], 'catalog': model['catalog']}
         )
+    
+    def load_latent_factors(self, version=None):
+        """Load a trained latent-factor model from the artifact store
         
-        if user_id not in user_similarity_df.index:
-            return self.content_based_recommendations(user_id, num_recommendations)
+        Factors only apply to the catalog they were trained on: an artifact
+        whose catalog signature differs from the loaded datasets (or that
+        predates signatures) is skipped and None is returned.
+        """
+        snapshot = self.current_state()[0]
+        objects, record = self.artifact_store.load(version)
+        if record['metadata'].get('catalog') != snapshot.catalog:
+            return None
+        self.latent_model = {
+            **objects['factors'],
+            **objects['ids'],
+            'explained_variance': record['metadata'].get('explained_variance'),
+            'catalog': record['metadata']['catalog']
+        }
+        self._publish_latent(snapshot)
+        return record['version']
+    
+    def _publish_latent(self, snapshot):
+        with self._datasets_lock:
+            # Datasets reloaded meanwhile: align to the snapshot now published
+            snapshot = self.state[0] or snapshot
+            self.state = (snapshot, snapshot.align_latent(self.latent_model))
+    
+    def latent_factor_recommendations(self, user_id, num_recommendations=5, state=None):
+        """Score the whole catalog with one dot product against the item embeddings"""
+        state = state or self.current_state()
+        snapshot, latent = state
+        courses_df, interactions_df = snapshot.courses_df, snapshot.interactions_df
+        if latent is None:
+            return self.collaborative_filtering_recommendations(user_id, num_recommendations, state)
         
-        # Find similar users
-        similar_users = user_similarity_df[user_id].sort_values(ascending=False)[1:4]
+        position = latent['user_positions'].get(user_id)
+        if position is None:
+            user_vector = latent['cold_start_vector']
+            reason = "Popular with learners just starting out"
+        else:
+            user_vector = latent['model']['user_factors'][position]
+            reason = "Learners with similar patterns rated this highly"
         
-        # Get courses liked by similar users
-        recommendations = []
-        user_courses = interactions_df[interactions_df['user_id'] == user_id]['course_id'].tolist()
-        
-        for similar_user_id, similarity_score in similar_users.items():
-            similar_user_courses = interactions_df[
-                (interactions_df['user_id'] == similar_user_id) & 
-                (interactions_df['rating'] >= 4)
-            ]['course_id'].tolist()
-            
-            for course_id in similar_user_courses:
-                if course_id not in user_courses:
-                    course_info = courses_df[courses_df['course_id'] == course_id].iloc[0]
-                    recommendations.append({
-                        'course_id': course_id,
-                        'title': course_info['title'],
-                        'category': course_info['category'],
-                        'level': course_info['level'],
-                        'score': similarity_score,
-                        'reason': f"Users with similar interests rated this highly"
-                    })
-        
-        # Remove duplicates and sort
-        seen_courses = set()
-        unique_recommendations = []
-        for rec in recommendations:
-            if rec['course_id'] not in seen_courses:
-                seen_courses.add(rec['course_id'])
-                unique_recommendations.append(rec)
-        
-        unique_recommendations.sort(key=lambda x: x['score'], reverse=True)
-        return unique_recommendations[:num_recommendations]
+        # Reconstructed ratings on the 0-5 scale, mapped to 0-1 like the other scorers
+        scores = np.clip(latent['item_factors'] @ user_vector / 5.0, 0, 1)
+        taken_rows = snapshot.course_rows(interactions_df['course_id'].to_numpy()[snapshot.user_interaction_rows(user_id)])
+        candidates = np.setdiff1d(np.arange(len(courses_df)), taken_rows)
+        best = candidates[top_k_indices(scores[candidates], num_recommendations)]
+        
+        selected = courses_df.iloc[best]
+        return [
+            {
+                'course_id': course_id,
+                'title': title,
+                'category': category,
+                'level': level,
+                'score': float(score),
+                'reason': reason
+            }
+            for course_id, title, category, level, score in zip(
+                selected['course_id'].tolist(), selected['title'].tolist(),
+                selected['category'].tolist(), selected['level'].tolist(), scores[best]
+            )
+        ]
     
     def hybrid_recommendations(self, user_id, num_recommendations=5):
         """Combine content-based and collaborative filtering"""
-        content_recs = self.content_based_recommendations(user_id, num_recommendations)
-        collab_recs = self.collaborative_filtering_recommendations(user_id, num_recommendations)
+        # Both scorers read the same published snapshot
+        state = self.current_state()
+        content_recs = self.content_based_recommendations(user_id, num_recommendations, state)
+        if state[1] is not None:
+            collab_recs = self.latent_factor_recommendations(user_id, num_recommendations, state)
+        else:
+            collab_recs = self.collaborative_filtering_recommendations(user_id, num_recommendations, state)
         
         # Combine and weight recommendations
         all_recs = {}
@@ -246,6 +547,9 @@ class PersonalizedRecommendationEngine:
         
         # Add collaborative filtering recommendations with weight 0.4
         for rec in collab_recs:
+            # A zero score carries no signal and would only displace content picks
+            if rec['score'] <= 0:
+                continue
             course_id = rec['course_id']
             if course_id in all_recs:
                 all_recs[course_id]['score'] += rec['score'] * 0.4
@@ -268,10 +572,23 @@ def main():
         print(json.dumps({"error": "Please provide user_id"}))
         return
     
-    user_id = int(sys.argv[1])
+    engine = PersonalizedRecommendationEngine(data_dir=os.environ.get('RECOMMENDER_DATA_DIR'))
+    
+    if sys.argv[1] == 'train-factors':
+        # Offline training of the latent-factor model
+        training_results = engine.train_latent_factors()
+        training_results['model_version'] = engine.save_latent_factors()
+        print(json.dumps(training_results, indent=2))
+        return
+    
+    user_id = parse_user_id(sys.argv[1])
     num_recs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
     
-    engine = PersonalizedRecommendationEngine()
+    try:
+        engine.load_latent_factors()
+    except FileNotFoundError:
+        pass
+    
     recommendations = engine.hybrid_recommendations(user_id, num_recs)
     
     print(json.dumps(recommendations, indent=2))
@@ -0,0 +1,144 @@
+import numpy as np
+from scipy.special import expit
+from sklearn.ensemble import (
+    RandomForestRegressor, GradientBoostingClassifier, GradientBoostingRegressor,
+    HistGradientBoostingClassifier, HistGradientBoostingRegressor
+)
+
+LINKS = {
+    'identity': lambda raw: raw,
+    'logistic': expit
+}
+
+
+class CompiledTreeEnsemble:
+    """A fitted tree ensemble flattened into NumPy node arrays
+
+    All trees share one set of (feature, threshold, left, right, value)
+    arrays; `roots` holds each tree's first node and leaves point to
+    themselves. Every (row, tree) pair descends in vectorised steps, one level
+    per step, dropping out once it reaches a leaf. The prediction is
+    link(base + scale * sum of leaf values).
+    """
+
+    def __init__(self, feature, threshold, left, right, value, missing_left, roots,
+                 base=0.0, scale=1.0, link='identity'):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.missing_left = missing_left
+        self.roots = roots
+        self.is_leaf = left == np.arange(len(left))
+        self.base = base
+        self.scale = scale
+        self.link = link
+
+    @classmethod
+    def from_trees(cls, trees, **kwargs):
+        """Concatenate trees given as (feature, threshold, left, right, value, missing_left)"""
+        offsets = np.cumsum([0] + [len(tree[0]) for tree in trees])
+        columns = {name: [] for name in ('feature', 'threshold', 'left', 'right', 'value', 'missing_left')}
+        for offset, (feature, threshold, left, right, value, missing_left) in zip(offsets, trees):
+            nodes = np.arange(len(feature))
+            leaf = left < 0
+            # Leaves point to themselves and read a valid feature column
+            columns['feature'].append(np.where(leaf, 0, feature))
+            columns['threshold'].append(threshold)
+            columns['left'].append(np.where(leaf, nodes, left) + offset)
+            columns['right'].append(np.where(leaf, nodes, right) + offset)
+            columns['value'].append(value)
+            columns['missing_left'].append(missing_left)
+        return cls(
+            np.concatenate(columns['feature']).astype(np.int32),
+            np.concatenate(columns['threshold']).astype(np.float64),
+            np.concatenate(columns['left']).astype(np.int32),
+            np.concatenate(columns['right']).astype(np.int32),
+            np.concatenate(columns['value']).astype(np.float64),
+            np.concatenate(columns['missing_left']).astype(bool),
+            offsets[:-1].astype(np.int32),
+            **kwargs
+        )
+
+    def raw_predict(self, X):
+        # float32 inputs widen exactly, matching sklearn's own comparisons
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        n_rows, n_features = X.shape
+        n_trees = len(self.roots)
+        has_missing = np.isnan(X).any()
+        flat_X = X.ravel()
+        
+        # One entry per (row, tree) pair: its current node and the row's offset into flat_X
+        nodes = np.tile(self.roots, n_rows)
+        row_offsets = np.repeat(np.arange(n_rows) * n_features, n_trees)
+        active = np.arange(n_rows * n_trees)
+        while active.size:
+            current = nodes[active]
+            inner = ~self.is_leaf[current]
+            active, current = active[inner], current[inner]
+            values = flat_X[row_offsets[active] + self.feature[current]]
+            go_left = values <= self.threshold[current]
+            if has_missing:
+                go_left |= np.isnan(values) & self.missing_left[current]
+            nodes[active] = np.where(go_left, self.left[current], self.right[current])
+        
+        return self.base + self.scale * self.value[nodes].reshape(n_rows, n_trees).sum(axis=1)
+
+    def predict(self, X):
+        """Regression value, or positive-class probability for binary classifiers"""
+        return LINKS[self.link](self.raw_predict(X))
+
+
+def _sklearn_tree(tree):
+    missing_left = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=bool))
+    return tree.feature, tree.threshold, tree.children_left, tree.children_right, tree.value[:, 0, 0], missing_left
+
+
+def _hist_tree(predictor):
+    nodes = predictor.nodes
+    if nodes['is_categorical'].any():
+        raise TypeError("Categorical splits are not supported by the tree compiler")
+    return (
+        nodes['feature_idx'], nodes['num_threshold'],
+        # Child indices are unsigned; leaves get -1 like sklearn trees
+        np.where(nodes['is_leaf'], -1, nodes['left'].astype(np.int64)),
+        np.where(nodes['is_leaf'], -1, nodes['right'].astype(np.int64)),
+        nodes['value'], nodes['missing_go_to_left']
+    )
+
+
+def compile_model(model):
+    """Flatten a fitted RandomForestRegressor, GradientBoosting* or HistGradientBoosting*
+
+    Classifiers must be binary; their compiled predict returns P(class 1).
+    Anything else raises TypeError so callers can fall back to sklearn.
+    """
+    if isinstance(model, RandomForestRegressor):
+        trees = [_sklearn_tree(estimator.tree_) for estimator in model.estimators_]
+        return CompiledTreeEnsemble.from_trees(trees, scale=1.0 / len(trees))
+
+    if isinstance(model, (GradientBoostingClassifier, GradientBoostingRegressor)):
+        if model.estimators_.shape[1] != 1:
+            raise TypeError("Only binary gradient boosting classifiers can be compiled")
+        if isinstance(model, GradientBoostingClassifier) and model.loss != 'log_loss':
+            raise TypeError(f"Unsupported gradient boosting loss: {model.loss}")
+        if isinstance(model, GradientBoostingRegressor) and model.loss != 'squared_error':
+            raise TypeError(f"Unsupported gradient boosting loss: {model.loss}")
+        trees = [_sklearn_tree(estimator.tree_) for estimator in model.estimators_[:, 0]]
+        # The initial estimator is constant, so its raw prediction is the same for any row
+        base = float(model._raw_predict_init(np.zeros((1, model.n_features_in_)))[0, 0])
+        link = 'logistic' if isinstance(model, GradientBoostingClassifier) else 'identity'
+        return CompiledTreeEnsemble.from_trees(trees, base=base, scale=model.learning_rate, link=link)
+
+    if isinstance(model, (HistGradientBoostingClassifier, HistGradientBoostingRegressor)):
+        if any(len(predictors) != 1 for predictors in model._predictors):
+            raise TypeError("Only binary histogram gradient boosting classifiers can be compiled")
+        if isinstance(model, HistGradientBoostingRegressor) and model.loss != 'squared_error':
+            raise TypeError(f"Unsupported histogram gradient boosting loss: {model.loss}")
+        # Leaf values already include the learning rate
+        trees = [_hist_tree(predictors[0]) for predictors in model._predictors]
+        link = 'logistic' if isinstance(model, HistGradientBoostingClassifier) else 'identity'
+        return CompiledTreeEnsemble.from_trees(trees, base=float(np.ravel(model._baseline_prediction)[0]), link=link)
+
+    raise TypeError(f"Cannot compile {type(model).__name__}")